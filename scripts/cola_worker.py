@@ -23,6 +23,9 @@ USAGE:
     # Just details (Phase 2) - requires links already collected
     python cola_worker.py --name worker_1 --months 2025-01 --details-only
     
+    # Details with 3 browsers in parallel
+    python cola_worker.py --name worker_1 --months 2025-01 --details-only --detail-workers 3
+    
     # Check status
     python cola_worker.py --name worker_1 --status
 
@@ -40,14 +43,25 @@ import re
 import time
 import json
 import logging
+import queue
 import sqlite3
 import argparse
+import threading
 from datetime import datetime, timedelta
 from calendar import monthrange
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, Iterator, List, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+try:
+    import lxml  # noqa: F401 - C tree builder for BeautifulSoup
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -64,9 +78,107 @@ from webdriver_manager.firefox import GeckoDriverManager
 TTB_BASE_URL = "https://ttbonline.gov"
 TTB_SEARCH_URL = f"{TTB_BASE_URL}/colasonline/publicSearchColasBasic.do"
 TTB_ID_PATTERN = re.compile(r'ttbid=(\d{14})')
+TOTAL_COUNT_PATTERN = re.compile(r'Total Matching Records:\s*(\d+)')
+RANGE_COUNT_PATTERN = re.compile(r'\d+\s+to\s+\d+\s+of\s+(\d+)')
+CAPTCHA_INDICATORS = ('captcha', 'what code is in the image', 'g-recaptcha',
+                      'access denied', 'support id')
+
+# Firefox prefs that skip downloads the scraper never reads. Images and stylesheets
+# are only blocked headless: a visible browser must still render an image CAPTCHA
+FIREFOX_PREFS = {
+    'browser.display.use_document_fonts': 0,  # no web fonts
+    'dom.webnotifications.enabled': False,
+    'media.autoplay.default': 5,              # block all autoplay
+}
+FIREFOX_HEADLESS_PREFS = {
+    'permissions.default.image': 2,
+    'permissions.default.stylesheet': 2,
+}
+
+# Elements that mark a loaded detail page (its labelled field table) or a CAPTCHA
+# challenge; detail loads wait for one of these rather than the full page load
+DETAIL_READY_SELECTOR = 'div.box strong'
+CAPTCHA_SELECTOR = '.g-recaptcha, iframe[src*="captcha"], img[src*="captcha"], #captcha'
+PHONE_PREFIX_PATTERN = re.compile(r'^Phone Number:\s*')
+HTML_PARSER = 'lxml' if HAS_LXML else 'html.parser'
 MAX_RESULTS_PER_QUERY = 1000
 VERIFICATION_TOLERANCE = 1.0  # 100% match required
 
+# Detail-page fields and their labels - EXACT labels from TTB website.
+# Fields with several labels use the first one that yields a value.
+DETAIL_FIELD_LABELS = {
+    # Core fields
+    'status': ('Status:',),
+    'vendor_code': ('Vendor Code:',),
+    'serial_number': ('Serial #:',),
+    'class_type_code': ('Class/Type Code:',),
+    'origin_code': ('Origin Code:',),
+    'brand_name': ('Brand Name:',),
+    'fanciful_name': ('Fanciful Name:',),
+    'type_of_application': ('Type of Application:',),
+    'for_sale_in': ('For Sale In:',),
+    'total_bottle_capacity': ('Total Bottle Capacity:',),
+    'formula': ('Formula :',),  # TTB has space before colon
+    'approval_date': ('Approval Date:',),
+    'qualifications': ('Qualifications:',),
+    # Wine-specific fields
+    'grape_varietal': ('Grape Varietal(s):', 'Grape Varietal:'),
+    'wine_vintage': ('Vintage Date:', 'Wine Vintage:'),
+    'appellation': ('Appellation:',),
+    # Other product-specific fields
+    'alcohol_content': ('Alcohol Content:',),
+    'ph_level': ('pH Level:',),
+}
+
+# Fields every real detail page fills in. A detail page fetched over HTTP that
+# lacks one of these (or the TTB ID itself) is an error, expired-session or
+# search page, and is reloaded in the browser instead of saved as an empty row
+DETAIL_REQUIRED_FIELDS = ('status', 'brand_name', 'approval_date')
+
+# Detail-page columns written to the colas table, in insert order
+COLA_COLUMNS = (
+    'ttb_id', 'status', 'vendor_code', 'serial_number', 'class_type_code',
+    'origin_code', 'brand_name', 'fanciful_name', 'type_of_application',
+    'for_sale_in', 'total_bottle_capacity', 'formula', 'approval_date',
+    'qualifications', 'grape_varietal', 'wine_vintage', 'appellation',
+    'alcohol_content', 'ph_level', 'plant_registry', 'company_name',
+    'street', 'state', 'contact_person', 'phone_number', 'year', 'month', 'day',
+)
+COLA_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO colas ({', '.join(COLA_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(COLA_COLUMNS))})"
+)
+
+# Phase 2 writer thread: rows queued ahead of it, and the most rows / longest
+# wait (seconds) gathered into one transaction
+WRITE_QUEUE_SIZE = 1000
+WRITER_BATCH_ROWS = 500
+WRITER_MAX_WAIT = 1.0
+
+# Worker databases hold scratch scrape data: WAL with relaxed fsync, a 64 MB
+# page cache, memory-mapped reads, and a busy timeout for concurrent readers
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
+
+
+# geckodriver binary path, resolved once per process (install() checks for
+# driver updates over the network on every call)
+_GECKO_PATH: Optional[str] = None
+
+
+def _gecko_driver_path() -> str:
+    """Return the geckodriver path, downloading/resolving it on first use."""
+    global _GECKO_PATH
+    if _GECKO_PATH is None:
+        _GECKO_PATH = GeckoDriverManager().install()
+    return _GECKO_PATH
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Data Classes
@@ -114,7 +226,9 @@ class ColaWorker:
                  headless: bool = False,
                  request_delay: float = 1.5,
                  page_timeout: int = 30,
-                 max_retries: int = 3):
+                 max_retries: int = 3,
+                 detail_workers: int = 1,
+                 http_details: bool = False):
         
         self.name = name
         self.db_path = db_path or f"data/{name}.db"
@@ -122,9 +236,17 @@ class ColaWorker:
         self.request_delay = request_delay
         self.page_timeout = page_timeout
         self.max_retries = max_retries
+        self.detail_workers = max(1, detail_workers)  # browsers used for Phase 2
+        self.http_details = http_details  # opt-in: fetch detail pages without rendering them
         
         self.driver: Optional[webdriver.Firefox] = None
+        self.http: Optional[requests.Session] = None
+        self._captcha_lock = threading.RLock()  # one CAPTCHA prompt at a time
         self.conn: Optional[sqlite3.Connection] = None
+        self._write_q: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._writer_error: Optional[BaseException] = None
+        self._write_failed = 0
         
         # Setup logging
         self._setup_logging()
@@ -154,6 +276,7 @@ class ColaWorker:
         
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SQLITE_PRAGMAS)
         
         self.conn.executescript("""
             -- Track progress for each month
@@ -236,14 +359,16 @@ class ColaWorker:
                 scraped_at TEXT DEFAULT CURRENT_TIMESTAMP
             );
             
-            -- Indexes for performance
+            -- Indexes for performance (ttb_id lookups use the UNIQUE constraints' indexes)
             CREATE INDEX IF NOT EXISTS idx_progress_ym ON month_progress(year, month);
-            CREATE INDEX IF NOT EXISTS idx_links_ttb ON collected_links(ttb_id);
             CREATE INDEX IF NOT EXISTS idx_links_ym ON collected_links(year, month);
             CREATE INDEX IF NOT EXISTS idx_links_scraped ON collected_links(year, month, scraped);
-            CREATE INDEX IF NOT EXISTS idx_colas_ttb ON colas(ttb_id);
             CREATE INDEX IF NOT EXISTS idx_colas_ym ON colas(year, month);
             CREATE INDEX IF NOT EXISTS idx_colas_date ON colas(approval_date);
+            
+            -- Older worker databases carry duplicate ttb_id indexes; drop them
+            DROP INDEX IF EXISTS idx_links_ttb;
+            DROP INDEX IF EXISTS idx_colas_ttb;
         """)
         self.conn.commit()
     
@@ -255,20 +380,30 @@ class ColaWorker:
             except:
                 pass
 
+        self.driver = self._create_driver(max_retries)
+    
+    def _create_driver(self, max_retries: int = 3) -> webdriver.Firefox:
+        """Start a Firefox browser, retrying on startup failures."""
         options = webdriver.FirefoxOptions()
         if self.headless:
             options.add_argument('--headless')
+        # Return from get() at DOMContentLoaded; pages are read as soon as the
+        # elements we need exist, not after every image and font has loaded
+        options.page_load_strategy = 'eager'
+        prefs = {**FIREFOX_PREFS, **(FIREFOX_HEADLESS_PREFS if self.headless else {})}
+        for name, value in prefs.items():
+            options.set_preference(name, value)
 
         last_error = None
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"Starting Firefox browser... (attempt {attempt + 1}/{max_retries})")
-                self.driver = webdriver.Firefox(
-                    service=FirefoxService(GeckoDriverManager().install()),
+                driver = webdriver.Firefox(
+                    service=FirefoxService(_gecko_driver_path()),
                     options=options
                 )
-                self.driver.set_page_load_timeout(self.page_timeout)
-                return  # Success
+                driver.set_page_load_timeout(self.page_timeout)
+                return driver  # Success
             except Exception as e:
                 last_error = e
                 self.logger.warning(f"Firefox startup failed: {e}")
@@ -280,9 +415,27 @@ class ColaWorker:
         raise last_error or Exception("Failed to start Firefox after retries")
     
     def _ensure_driver(self):
-        """Ensure browser is running."""
-        if not self.driver:
-            self._init_driver()
+        """Ensure browser is running, restarting it if it stopped responding."""
+        if self.driver:
+            try:
+                self.driver.title  # cheap round-trip; raises if the browser is gone
+                return
+            except Exception:
+                self.logger.warning("Browser not responding, restarting it")
+        self._init_driver()
+    
+    def open_database(self, db_path: str):
+        """Point the worker at another database, keeping the browser running."""
+        self.close_database()
+        self.db_path = db_path
+        self._init_database()
+    
+    def close_database(self):
+        """Flush pending writes and close the database; the browser stays up."""
+        self._stop_writer()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
     
     def close(self):
         """Clean up resources."""
@@ -293,9 +446,11 @@ class ColaWorker:
                 pass
             self.driver = None
         
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        if self.http:
+            self.http.close()
+            self.http = None
+        
+        self.close_database()
     
     def _delay(self, multiplier: float = 1.0):
         """Wait between requests."""
@@ -305,42 +460,41 @@ class ColaWorker:
     # CAPTCHA Handling
     # ─────────────────────────────────────────────────────────────────────────
     
-    def _detect_captcha(self) -> bool:
+    def _detect_captcha(self, driver: webdriver.Firefox = None) -> bool:
         """Check if CAPTCHA is present."""
         try:
-            html = self.driver.page_source.lower()
-            indicators = ['captcha', 'what code is in the image', 'g-recaptcha',
-                         'access denied', 'support id']
-            return any(ind in html for ind in indicators)
+            html = (driver or self.driver).page_source.lower()
+            return any(ind in html for ind in CAPTCHA_INDICATORS)
         except:
             return False
     
-    def _handle_captcha(self) -> bool:
+    def _handle_captcha(self, driver: webdriver.Firefox = None) -> bool:
         """Handle CAPTCHA if present. Returns True if OK to continue."""
-        if not self._detect_captcha():
+        if not self._detect_captcha(driver):
             return True
         
-        print(f"\n{'='*60}")
-        print(f"[{self.name}] CAPTCHA DETECTED!")
-        print(f"{'='*60}")
-        print(f"Solve the CAPTCHA in the browser window.")
-        print(f"Then press ENTER to continue (or 'quit' to stop)...")
-        
-        try:
-            response = input("> ").strip().lower()
-            if response == 'quit':
-                return False
+        with self._captcha_lock:
+            print(f"\n{'='*60}")
+            print(f"[{self.name}] CAPTCHA DETECTED!")
+            print(f"{'='*60}")
+            print(f"Solve the CAPTCHA in the browser window.")
+            print(f"Then press ENTER to continue (or 'quit' to stop)...")
             
-            if self._detect_captcha():
-                print(f"[{self.name}] CAPTCHA still present. Try again...")
-                return self._handle_captcha()
-            
-            print(f"[{self.name}] [OK] CAPTCHA solved!")
-            time.sleep(2)
-            return True
-        except EOFError:
-            time.sleep(30)
-            return not self._detect_captcha()
+            try:
+                response = input("> ").strip().lower()
+                if response == 'quit':
+                    return False
+                
+                if self._detect_captcha(driver):
+                    print(f"[{self.name}] CAPTCHA still present. Try again...")
+                    return self._handle_captcha(driver)
+                
+                print(f"[{self.name}] [OK] CAPTCHA solved!")
+                time.sleep(2)
+                return True
+            except EOFError:
+                time.sleep(30)
+                return not self._detect_captcha(driver)
     
     # ─────────────────────────────────────────────────────────────────────────
     # TTB Search
@@ -426,12 +580,12 @@ class ColaWorker:
             html = self.driver.page_source
             
             # Primary pattern
-            match = re.search(r'Total Matching Records:\s*(\d+)', html)
+            match = TOTAL_COUNT_PATTERN.search(html)
             if match:
                 return int(match.group(1))
             
             # Fallback pattern
-            match = re.search(r'\d+\s+to\s+\d+\s+of\s+(\d+)', html)
+            match = RANGE_COUNT_PATTERN.search(html)
             if match:
                 return int(match.group(1))
             
@@ -498,18 +652,13 @@ class ColaWorker:
                 self.logger.info(f"  Page {page}: no links found, stopping")
                 break
             
-            # Save to database
-            for ttb_id, url in links:
-                try:
-                    self.conn.execute("""
-                        INSERT OR IGNORE INTO collected_links 
-                        (ttb_id, detail_url, year, month)
-                        VALUES (?, ?, ?, ?)
-                    """, (ttb_id, url, year, month))
-                except:
-                    pass
-            
-            self.conn.commit()
+            # Save to database (one transaction per page)
+            with self.conn:
+                self.conn.executemany("""
+                    INSERT OR IGNORE INTO collected_links 
+                    (ttb_id, detail_url, year, month)
+                    VALUES (?, ?, ?, ?)
+                """, [(ttb_id, url, year, month) for ttb_id, url in links])
             collected += len(links)
             
             self.logger.info(f"  Page {page}: {len(links)} links (total: {collected:,})")
@@ -684,68 +833,82 @@ class ColaWorker:
     # Phase 2: Detail Scraping
     # ─────────────────────────────────────────────────────────────────────────
     
-    def _scrape_detail_page(self, ttb_id: str, url: str) -> Optional[Dict]:
-        """Scrape a single COLA detail page with ALL fields."""
+    def _sync_http_session(self, driver: webdriver.Firefox = None):
+        """
+        Point the HTTP session at the browser's identity: copy its cookies and
+        User-Agent so plain requests are treated like the Selenium session.
+        """
+        driver = driver or self.driver
+        if not self.http:
+            self.http = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            self.http.mount('https://', adapter)
+            self.http.mount('http://', adapter)
+        try:
+            self.http.headers['User-Agent'] = driver.execute_script('return navigator.userAgent')
+            for cookie in driver.get_cookies():
+                self.http.cookies.set(cookie['name'], cookie['value'],
+                                      domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        except Exception as e:
+            self.logger.warning(f"Could not copy browser session: {e}")
+    
+    def _fetch_detail_http(self, url: str) -> Optional[str]:
+        """
+        Fetch a detail page over plain HTTP. Detail pages are server-rendered, so
+        no browser is needed to read them. Returns None when the browser should
+        load the page instead (HTTP disabled, request failed, or a CAPTCHA came back).
+        """
+        if not self.http:
+            return None
+        try:
+            response = self.http.get(url, timeout=self.page_timeout)
+        except requests.RequestException as e:
+            self.logger.warning(f"    HTTP fetch failed, using browser: {e}")
+            return None
+        
+        html = response.text
+        if response.status_code != 200 or any(ind in html.lower() for ind in CAPTCHA_INDICATORS):
+            return None
+        return html
+    
+    def _scrape_detail_page(self, ttb_id: str, url: str,
+                            driver: webdriver.Firefox = None) -> Optional[Dict]:
+        """
+        Scrape a single COLA detail page with ALL fields.
+        Fetched over HTTP when enabled and the response is a complete detail page,
+        otherwise loaded in driver (default self.driver).
+        """
+        driver = driver or self.driver
         for attempt in range(self.max_retries):
             try:
-                self.driver.get(url)
-                WebDriverWait(self.driver, self.page_timeout).until(
-                    lambda d: d.execute_script('return document.readyState') == 'complete'
-                )
-                
-                if not self._handle_captcha():
-                    return None
-                
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Core fields - using EXACT labels from TTB website
-                data = {
-                    'ttb_id': ttb_id,
-                    'status': self._extract_field(soup, 'Status:'),
-                    'vendor_code': self._extract_field(soup, 'Vendor Code:'),
-                    'serial_number': self._extract_field(soup, 'Serial #:'),
-                    'class_type_code': self._extract_field(soup, 'Class/Type Code:'),
-                    'origin_code': self._extract_field(soup, 'Origin Code:'),
-                    'brand_name': self._extract_field(soup, 'Brand Name:'),
-                    'fanciful_name': self._extract_field(soup, 'Fanciful Name:'),
-                    'type_of_application': self._extract_field(soup, 'Type of Application:'),
-                    'for_sale_in': self._extract_field(soup, 'For Sale In:'),
-                    'total_bottle_capacity': self._extract_field(soup, 'Total Bottle Capacity:'),
-                    'formula': self._extract_field(soup, 'Formula :'),  # TTB has space before colon
-                    'approval_date': self._extract_field(soup, 'Approval Date:'),
-                    'qualifications': self._extract_field(soup, 'Qualifications:'),
-                }
-                
-                # Wine-specific fields
-                data['grape_varietal'] = self._extract_field(soup, 'Grape Varietal(s):')
-                if not data['grape_varietal']:
-                    data['grape_varietal'] = self._extract_field(soup, 'Grape Varietal:')
+                html = self._fetch_detail_http(url)
+                if html is not None:
+                    data = self._parse_detail_page(ttb_id, html)
+                    if ttb_id in html and all(data.get(f) for f in DETAIL_REQUIRED_FIELDS):
+                        return data
+                    self.logger.warning("    HTTP response is not a complete detail page, using browser")
                 
-                data['wine_vintage'] = self._extract_field(soup, 'Vintage Date:')
-                if not data['wine_vintage']:
-                    data['wine_vintage'] = self._extract_field(soup, 'Wine Vintage:')
+                driver.get(url)
+                try:
+                    WebDriverWait(driver, self.page_timeout).until(EC.any_of(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, DETAIL_READY_SELECTOR)),
+                        EC.presence_of_element_located((By.CSS_SELECTOR, CAPTCHA_SELECTOR)),
+                    ))
+                except TimeoutException:
+                    # A block page without a recognisable CAPTCHA widget still
+                    # goes to the CAPTCHA prompt; anything else is a real timeout
+                    if not self._detect_captcha(driver):
+                        raise
                 
-                data['appellation'] = self._extract_field(soup, 'Appellation:')
+                if not self._handle_captcha(driver):
+                    return None
                 
-                # Other product-specific fields
-                data['alcohol_content'] = self._extract_field(soup, 'Alcohol Content:')
-                data['ph_level'] = self._extract_field(soup, 'pH Level:')
+                html = driver.page_source
+                if self.http:
+                    # Pick up any cookies issued to the browser (e.g. after a CAPTCHA)
+                    self._sync_http_session(driver)
                 
-                # Add company details
-                data.update(self._extract_company_details(soup))
-
-                # Parse approval_date into year, month, day for indexed queries
-                if data.get('approval_date'):
-                    parts = data['approval_date'].split('/')
-                    if len(parts) == 3:
-                        try:
-                            data['month'] = int(parts[0])
-                            data['day'] = int(parts[1])
-                            data['year'] = int(parts[2])
-                        except ValueError:
-                            pass  # Leave as None if parsing fails
-
-                return data
+                return self._parse_detail_page(ttb_id, html)
                 
             except TimeoutException:
                 if attempt < self.max_retries - 1:
@@ -760,23 +923,56 @@ class ColaWorker:
         
         return None
     
-    def _extract_field(self, soup: BeautifulSoup, label: str) -> Optional[str]:
+    def _parse_detail_page(self, ttb_id: str, html: str) -> Dict:
+        """Extract ALL fields from a COLA detail page's HTML."""
+        soup = BeautifulSoup(html, HTML_PARSER)
+        strongs = self._index_labels(soup)
+        
+        data = {'ttb_id': ttb_id}
+        for field, labels in DETAIL_FIELD_LABELS.items():
+            value = None
+            for label in labels:
+                value = self._extract_field(strongs, label)
+                if value:
+                    break
+            data[field] = value
+        
+        # Add company details
+        data.update(self._extract_company_details(soup))
+
+        # Parse approval_date into year, month, day for indexed queries
+        if data.get('approval_date'):
+            parts = data['approval_date'].split('/')
+            if len(parts) == 3:
+                try:
+                    data['month'] = int(parts[0])
+                    data['day'] = int(parts[1])
+                    data['year'] = int(parts[2])
+                except ValueError:
+                    pass  # Leave as None if parsing fails
+
+        return data
+    
+    def _index_labels(self, soup: BeautifulSoup) -> List[Tuple]:
+        """
+        Collect the page's <strong> label tags in one pass, as
+        (own string, lowercased text, tag) tuples for _extract_field.
+        """
+        return [(s.string, s.get_text().lower(), s) for s in soup.find_all('strong')]
+    
+    def _extract_field(self, strongs: List[Tuple], label: str) -> Optional[str]:
         """
         Extract a field value by its label.
         Handles TTB's HTML structure where labels are in <strong> tags.
         """
         try:
             # Method 1: Find exact match in strong tag
-            strong = soup.find('strong', string=lambda t: t and label in t)
+            strong = next((tag for string, _, tag in strongs if string and label in string), None)
             
             # Method 2: Try partial match if exact not found
             if not strong:
                 label_lower = label.rstrip(':').lower()
-                for s in soup.find_all('strong'):
-                    s_text = s.get_text() if s else ''
-                    if label_lower in s_text.lower():
-                        strong = s
-                        break
+                strong = next((tag for _, text, tag in strongs if label_lower in text), None)
             
             if not strong:
                 return None
@@ -833,13 +1029,157 @@ class ColaWorker:
                         td = rows[i + 2].find('td')
                         if td:
                             text = td.get_text(separator=' ').strip()
-                            data['phone_number'] = re.sub(r'^Phone Number:\s*', '', text).strip()
+                            data['phone_number'] = PHONE_PREFIX_PATTERN.sub('', text).strip()
                     break
         except:
             pass
         
         return data
     
+    def _scrape_links(self, links: List[Tuple[str, str]]) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        Scrape detail pages for (ttb_id, url) links, yielding (ttb_id, data) in link order.
+        With detail_workers > 1, pages are fetched concurrently on a pool of browsers;
+        results are still consumed (and written to the database) on the calling thread.
+        """
+        workers = min(self.detail_workers, len(links))
+        if workers <= 1:
+            for ttb_id, url in links:
+                data = self._scrape_detail_page(ttb_id, url)
+                self._delay(0.5)
+                yield ttb_id, data
+            return
+        
+        extra_drivers = []
+        for _ in range(workers - 1):
+            try:
+                extra_drivers.append(self._create_driver())
+            except Exception as e:
+                self.logger.warning(f"Could not start extra browser, continuing with {len(extra_drivers) + 1}: {e}")
+                break
+        
+        drivers = queue.Queue()
+        for driver in [self.driver] + extra_drivers:
+            drivers.put(driver)
+        
+        def scrape(link):
+            ttb_id, url = link
+            driver = drivers.get()
+            try:
+                data = self._scrape_detail_page(ttb_id, url, driver)
+                self._delay(0.5)  # per-browser pacing
+                return ttb_id, data
+            finally:
+                drivers.put(driver)
+        
+        self.logger.info(f"Scraping details with {len(extra_drivers) + 1} browsers")
+        pool = ThreadPoolExecutor(max_workers=len(extra_drivers) + 1)
+        try:
+            yield from pool.map(scrape, links)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            for driver in extra_drivers:
+                try:
+                    driver.quit()
+                except:
+                    pass
+    
+    def _write_details(self, rows: List[Tuple], conn: sqlite3.Connection = None) -> int:
+        """
+        Insert scraped COLA rows and mark their links scraped, in one transaction.
+        Returns the number of rows written (0 if the transaction failed).
+        """
+        conn = conn or self.conn
+        try:
+            with conn:
+                conn.executemany(COLA_INSERT_SQL, rows)
+                # Mark as scraped so we don't re-scrape on resume
+                conn.executemany(
+                    "UPDATE collected_links SET scraped = 1 WHERE ttb_id = ?",
+                    [(row[0],) for row in rows]
+                )
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"    DB error: {e}")
+            return 0
+    
+    def _start_writer(self):
+        """Start the Phase 2 writer thread; scraped rows are handed to it via _queue_write."""
+        self._write_q = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer_error = None
+        self._write_failed = 0
+        self._writer = threading.Thread(target=self._writer_loop,
+                                        name=f"{self.name}-writer", daemon=True)
+        self._writer.start()
+    
+    def _queue_write(self, row: Tuple):
+        """
+        Hand a row to the writer thread. Raises instead of blocking forever on
+        the bounded queue if the writer has died.
+        """
+        while True:
+            try:
+                self._write_q.put(row, timeout=1)
+                return
+            except queue.Full:
+                if not self._writer.is_alive():
+                    raise RuntimeError(f"Database writer thread stopped: {self._writer_error}") from self._writer_error
+    
+    def _stop_writer(self):
+        """
+        Flush queued rows and wait for the writer thread to finish.
+        Re-raises the writer's exception if it died.
+        """
+        if self._writer:
+            writer, self._writer = self._writer, None
+            while writer.is_alive():
+                try:
+                    self._write_q.put(None, timeout=1)
+                except queue.Full:
+                    continue  # re-check that the writer is still draining the queue
+                writer.join()
+            error, self._writer_error = self._writer_error, None
+            if error is not None:
+                raise RuntimeError(f"Database writer thread failed: {error}") from error
+    
+    def _writer_loop(self):
+        """
+        Drain _write_q until the None sentinel, committing up to WRITER_BATCH_ROWS
+        rows (or whatever arrived within WRITER_MAX_WAIT) per transaction. Runs on
+        its own connection; WAL lets the scraper thread keep reading meanwhile.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.executescript(SQLITE_PRAGMAS)
+        except BaseException as e:
+            self._writer_error = e
+            return
+        try:
+            done = False
+            while not done:
+                row = self._write_q.get()
+                if row is None:
+                    break
+                
+                batch = [row]
+                deadline = time.monotonic() + WRITER_MAX_WAIT
+                while len(batch) < WRITER_BATCH_ROWS:
+                    try:
+                        row = self._write_q.get(timeout=max(0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if row is None:
+                        done = True
+                        break
+                    batch.append(row)
+                
+                ok = self._write_details(batch, conn)
+                self._write_failed += len(batch) - ok
+        except BaseException as e:
+            self._writer_error = e  # re-raised on the scraper thread by _stop_writer
+        finally:
+            conn.close()
+    
     def scrape_details(self, year: int, month: int) -> MonthResult:
         """
         Phase 2: Scrape details for all collected links.
@@ -848,6 +1188,8 @@ class ColaWorker:
         Resume-safe: Only scrapes links where scraped=0 in collected_links table.
         """
         self._ensure_driver()
+        if self.http_details:
+            self._sync_http_session()
         
         # Get existing progress
         result = self._get_progress(year, month)
@@ -905,63 +1247,31 @@ class ColaWorker:
                 self._save_progress(result)
                 return result
             
-            # Scrape each link
+            # Scrape each link; the writer thread commits results in batches
             scraped = 0
             failed = 0
+            self._start_writer()
             
-            for i, (ttb_id, url) in enumerate(links):
-                # Log every scrape with TTB ID
-                self.logger.info(f"  [{i+1+already_done}/{total_links}] {ttb_id}")
-                
-                data = self._scrape_detail_page(ttb_id, url)
-                
-                if data:
-                    try:
-                        self.conn.execute("""
-                            INSERT OR REPLACE INTO colas
-                            (ttb_id, status, vendor_code, serial_number, class_type_code,
-                             origin_code, brand_name, fanciful_name, type_of_application,
-                             for_sale_in, total_bottle_capacity, formula, approval_date,
-                             qualifications, grape_varietal, wine_vintage, appellation,
-                             alcohol_content, ph_level, plant_registry, company_name,
-                             street, state, contact_person, phone_number, year, month, day)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            data.get('ttb_id'), data.get('status'), data.get('vendor_code'),
-                            data.get('serial_number'), data.get('class_type_code'),
-                            data.get('origin_code'), data.get('brand_name'),
-                            data.get('fanciful_name'), data.get('type_of_application'),
-                            data.get('for_sale_in'), data.get('total_bottle_capacity'),
-                            data.get('formula'), data.get('approval_date'),
-                            data.get('qualifications'), data.get('grape_varietal'),
-                            data.get('wine_vintage'), data.get('appellation'),
-                            data.get('alcohol_content'), data.get('ph_level'),
-                            data.get('plant_registry'), data.get('company_name'),
-                            data.get('street'), data.get('state'),
-                            data.get('contact_person'), data.get('phone_number'),
-                            data.get('year'), data.get('month'), data.get('day')
-                        ))
-                        
-                        # Mark as scraped so we don't re-scrape on resume
-                        self.conn.execute(
-                            "UPDATE collected_links SET scraped = 1 WHERE ttb_id = ?",
-                            (ttb_id,)
-                        )
-                        self.conn.commit()
+            try:
+                for i, (ttb_id, data) in enumerate(self._scrape_links(links)):
+                    # Log every scrape with TTB ID
+                    self.logger.info(f"  [{i+1+already_done}/{total_links}] {ttb_id}")
+                    
+                    if data:
+                        self._queue_write(tuple(data.get(col) for col in COLA_COLUMNS))
                         scraped += 1
-                        
-                    except Exception as e:
-                        self.logger.error(f"    DB error: {e}")
+                    else:
+                        self.logger.warning(f"    Failed to scrape")
                         failed += 1
-                else:
-                    self.logger.warning(f"    Failed to scrape")
-                    failed += 1
-                
-                self._delay(0.5)
-                
-                # Progress summary every 100
-                if (i + 1) % 100 == 0:
-                    self.logger.info(f"  Progress: {i+1+already_done:,}/{total_links:,} ({scraped:,} OK, {failed:,} failed)")
+                    
+                    # Progress summary every 100
+                    if (i + 1) % 100 == 0:
+                        self.logger.info(f"  Progress: {i+1+already_done:,}/{total_links:,} ({scraped:,} OK, {failed:,} failed)")
+            finally:
+                # Keep whatever was scraped, even if the loop was interrupted
+                self._stop_writer()
+                scraped -= self._write_failed
+                failed += self._write_failed
             
             # Final count
             total_scraped = self.conn.execute(
@@ -1258,6 +1568,17 @@ class ColaWorker:
 # Helper Functions
 # ─────────────────────────────────────────────────────────────────────────────
 
+def remove_database(db_path: str) -> None:
+    """Delete a worker database along with its WAL and shared-memory files.
+
+    Worker databases run in WAL mode, so a leftover -wal file would be replayed
+    into a freshly created database of the same name.
+    """
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
 def parse_month(s: str) -> Tuple[int, int]:
     """Parse 'YYYY-MM' string to (year, month) tuple."""
     parts = s.split('-')
@@ -1375,6 +1696,10 @@ Parallel Example (4 terminals):
                         help='Only scrape details (Phase 2)')
     parser.add_argument('--headless', action='store_true',
                         help='Run browser in headless mode')
+    parser.add_argument('--detail-workers', type=int, default=1, metavar='N',
+                        help='Browsers to scrape detail pages with in parallel (default: 1)')
+    parser.add_argument('--http-details', action='store_true',
+                        help='Fetch detail pages over HTTP, falling back to the browser (experimental)')
     parser.add_argument('--status', action='store_true',
                         help='Show database status')
     
@@ -1384,7 +1709,9 @@ Parallel Example (4 terminals):
     worker = ColaWorker(
         name=args.name,
         db_path=args.db,
-        headless=args.headless
+        headless=args.headless,
+        detail_workers=args.detail_workers,
+        http_details=args.http_details
     )
     
     try:
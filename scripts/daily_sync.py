@@ -39,7 +39,7 @@ SCRIPT_DIR = Path(__file__).parent.resolve()
 sys.path.insert(0, str(SCRIPT_DIR))
 
 # Import from existing modules
-from cola_worker import ColaWorker, parse_date
+from cola_worker import ColaWorker, parse_date, remove_database
 
 # Import shared D1 utilities
 from lib.d1_utils import (
@@ -47,6 +47,7 @@ from lib.d1_utils import (
     d1_execute,
     escape_sql_value,
     d1_insert_batch,
+    D1_INSERT_BATCH_ROWS,
     update_brand_slugs,
     add_new_companies,
     get_company_id,
@@ -115,7 +116,7 @@ logger = setup_logging()
 
 def sync_to_d1(records: List[Dict], dry_run: bool = False) -> Dict:
     """Sync records to D1."""
-    logger.info(f"Syncing {len(records):,} records to D1...")
+    logger.info("Syncing %s records to D1...", f"{len(records):,}")
 
     if dry_run:
         logger.info("[DRY RUN] Would insert records to D1")
@@ -128,12 +129,10 @@ def sync_to_d1(records: List[Dict], dry_run: bool = False) -> Dict:
     total_inserted = 0
     all_errors = []
 
-    for i in range(0, len(records), D1_BATCH_SIZE):
-        batch = records[i:i + D1_BATCH_SIZE]
-        batch_num = i // D1_BATCH_SIZE + 1
-        total_batches = (len(records) + D1_BATCH_SIZE - 1) // D1_BATCH_SIZE
-
-        logger.info(f"  Batch {batch_num}/{total_batches} ({len(batch)} records)...")
+    total_batches = (len(records) + D1_INSERT_BATCH_ROWS - 1) // D1_INSERT_BATCH_ROWS
+    batches = (records[i:i + D1_INSERT_BATCH_ROWS] for i in range(0, len(records), D1_INSERT_BATCH_ROWS))
+    for batch_num, batch in enumerate(batches, start=1):
+        logger.info("  Batch %d/%d (%d records)...", batch_num, total_batches, len(batch))
 
         result = d1_insert_batch(batch)
         total_inserted += result.get("inserted", 0)
@@ -141,7 +140,7 @@ def sync_to_d1(records: List[Dict], dry_run: bool = False) -> Dict:
         if result.get("error"):
             all_errors.append(result["error"])
 
-    logger.info(f"Sync complete: {total_inserted:,} records inserted")
+    logger.info("Sync complete: %s records inserted", f"{total_inserted:,}")
 
     # Update brand_slugs
     update_brand_slugs(records)
@@ -419,8 +418,7 @@ def run_daily_sync(
     os.makedirs(DATA_DIR, exist_ok=True)
 
     # Remove old temp db if exists
-    if os.path.exists(TEMP_DB):
-        os.remove(TEMP_DB)
+    remove_database(TEMP_DB)
 
     all_records = []
 
@@ -488,9 +486,8 @@ def run_daily_sync(
         classify_result = {'total': 0}
 
     # Clean up temp database
-    if os.path.exists(TEMP_DB):
-        os.remove(TEMP_DB)
-        logger.info("Cleaned up temp database")
+    remove_database(TEMP_DB)
+    logger.info("Cleaned up temp database")
 
     # Summary
     logger.info("\n" + "=" * 60)
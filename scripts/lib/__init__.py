@@ -7,6 +7,7 @@ BevAlc Intelligence shared library modules.
 from .d1_utils import (
     init_d1_config,
     d1_execute,
+    d1_execute_many,
     escape_sql_value,
     d1_insert_batch,
     make_slug,
@@ -18,6 +19,7 @@ from .d1_utils import (
 __all__ = [
     'init_d1_config',
     'd1_execute',
+    'd1_execute_many',
     'escape_sql_value',
     'd1_insert_batch',
     'make_slug',
@@ -6,6 +6,7 @@ and weekly_update.py scripts.
 
 Functions:
 - d1_execute: Execute SQL against D1 API
+- d1_execute_many: Execute several statements in one D1 API request
 - escape_sql_value: Safely escape values for inline SQL
 - d1_insert_batch: Batch insert COLA records
 - make_slug: Convert text to URL slug
@@ -16,10 +17,21 @@ Functions:
 
 import os
 import re
+import gzip
+import json
 import logging
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # =============================================================================
 # CONFIGURATION (set by calling script via init_d1_config)
@@ -31,6 +43,7 @@ _config = {
     'api_token': None,
     'api_url': None,
     'batch_size': 500,
+    'gzip_requests': False,
     'logger': None
 }
 
@@ -40,7 +53,8 @@ def init_d1_config(
     database_id: str = None,
     api_token: str = None,
     batch_size: int = 500,
-    logger: logging.Logger = None
+    logger: logging.Logger = None,
+    gzip_requests: bool = None
 ):
     """
     Initialize D1 configuration. Must be called before using other functions.
@@ -49,11 +63,15 @@ def init_d1_config(
     - CLOUDFLARE_ACCOUNT_ID
     - CLOUDFLARE_D1_DATABASE_ID
     - CLOUDFLARE_API_TOKEN
+    - D1_GZIP_REQUESTS ("1" to gzip large request bodies; off by default)
     """
     _config['account_id'] = account_id or os.environ.get("CLOUDFLARE_ACCOUNT_ID")
     _config['database_id'] = database_id or os.environ.get("CLOUDFLARE_D1_DATABASE_ID")
     _config['api_token'] = api_token or os.environ.get("CLOUDFLARE_API_TOKEN")
     _config['batch_size'] = batch_size
+    if gzip_requests is None:
+        gzip_requests = os.environ.get("D1_GZIP_REQUESTS") == "1"
+    _config['gzip_requests'] = gzip_requests
     _config['logger'] = logger or logging.getLogger(__name__)
 
     if _config['account_id'] and _config['database_id']:
@@ -70,6 +88,46 @@ def _get_logger():
     return _config['logger'] or logging.getLogger(__name__)
 
 
+# D1 rejects any single SQL statement over 100 KB; multi-row INSERTs are split
+# to stay safely below that
+D1_MAX_STATEMENT_BYTES = 90_000
+
+# Records per d1_insert_batch call. Values are inlined rather than bound, so
+# SQLite's ~999 parameter ceiling does not apply; each statement is capped by
+# D1_MAX_STATEMENT_BYTES instead, and this bounds the rows (and statements)
+# carried by one request
+D1_INSERT_BATCH_ROWS = 2000
+
+# With gzip_requests enabled (opt-in, see init_d1_config), request bodies larger
+# than this are sent gzip-compressed (Content-Encoding: gzip); multi-row INSERT
+# payloads compress several times over. A compressed request the API rejects
+# with 400/415 is resent uncompressed.
+D1_GZIP_MIN_BYTES = 1024
+
+# Shared HTTP session: keeps TLS connections to the D1 API alive across queries
+# (pool sized for concurrent insert workers). Only retries that cannot repeat a
+# statement are automatic: connection failures (nothing was sent) and 429
+# responses (rejected before running). Read errors and 5xx are not retried,
+# since D1 may already have applied the statements (UPDATEs, plain INSERTs and
+# INSERT OR REPLACE go through here too) before the response was lost.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=[429],
+        allowed_methods=frozenset({"POST"}),  # needed for the 429 retry only
+        raise_on_status=False,
+    ),
+))
+
+
 # =============================================================================
 # D1 API FUNCTIONS
 # =============================================================================
@@ -100,13 +158,28 @@ def d1_execute(sql: str, params: List[Any] = None) -> Dict:
     if params:
         payload["params"] = params
 
-    response = requests.post(_config['api_url'], headers=headers, json=payload)
+    body = orjson.dumps(payload) if HAS_ORJSON else json.dumps(payload).encode('utf-8')
+    if _config['gzip_requests'] and len(body) > D1_GZIP_MIN_BYTES:
+        response = _SESSION.post(
+            _config['api_url'],
+            headers={**headers, "Content-Encoding": "gzip"},
+            data=gzip.compress(body, compresslevel=6)
+        )
+        if response.status_code in (400, 415):
+            # The endpoint may not accept compressed bodies; retry as plain JSON
+            # (a rejected request did not run, so resending is safe)
+            response = _SESSION.post(_config['api_url'], headers=headers, data=body)
+            if response.status_code == 200:
+                logger.warning("D1 rejected a gzip request body; sending uncompressed from now on")
+                _config['gzip_requests'] = False
+    else:
+        response = _SESSION.post(_config['api_url'], headers=headers, data=body)
 
     if response.status_code != 200:
         logger.error(f"D1 API error: {response.status_code} - {response.text}")
         return {"success": False, "error": response.text}
 
-    result = response.json()
+    result = orjson.loads(response.content) if HAS_ORJSON else response.json()
 
     if result.get("errors"):
         logger.error(f"D1 errors: {result['errors']}")
@@ -114,6 +187,28 @@ def d1_execute(sql: str, params: List[Any] = None) -> Dict:
     return result
 
 
+def d1_execute_many(statements: List[str]) -> List[List[Dict]]:
+    """
+    Execute several SQL statements against Cloudflare D1 in one request.
+
+    The statements are sent as a single multi-statement query, so they cannot
+    take bound parameters; inline values with escape_sql_value().
+
+    Args:
+        statements: SQL statements, without trailing semicolons
+
+    Returns:
+        List of result rows for each statement, in order (empty if the request failed)
+    """
+    if not statements:
+        return []
+
+    result = d1_execute(";\n".join(statements))
+    if not result.get("success"):
+        return []
+    return [res.get("results", []) for res in result.get("result", [])]
+
+
 def escape_sql_value(value) -> str:
     """
     Escape a value for inline SQL.
@@ -143,6 +238,8 @@ def escape_sql_value(value) -> str:
     return f"'{s}'"
 
 
+# The same few hundred class/type codes recur in every insert batch
+@lru_cache(maxsize=1024)
 def classify_category(class_type_code: str) -> str:
     """
     Classify a class_type_code into a category for indexed queries.
@@ -183,47 +280,72 @@ def classify_category(class_type_code: str) -> str:
     return 'Other'
 
 
-def d1_insert_batch(records: List[Dict]) -> Dict:
+# colas columns written by d1_insert_batch: the record fields, then the derived category.
+# The INSERT prefix is built once here rather than on every batch.
+COLA_RECORD_COLUMNS = (
+    'ttb_id', 'status', 'vendor_code', 'serial_number', 'class_type_code',
+    'origin_code', 'brand_name', 'fanciful_name', 'type_of_application',
+    'for_sale_in', 'total_bottle_capacity', 'formula', 'approval_date',
+    'qualifications', 'grape_varietal', 'wine_vintage', 'appellation',
+    'alcohol_content', 'ph_level', 'plant_registry', 'company_name',
+    'street', 'state', 'contact_person', 'phone_number', 'year', 'month', 'day',
+)
+_COLA_INSERT_PREFIX = f"INSERT OR IGNORE INTO colas ({', '.join(COLA_RECORD_COLUMNS + ('category',))}) VALUES "
+_COLA_INSERT_PREFIX_BYTES = len(_COLA_INSERT_PREFIX.encode('utf-8'))
+
+
+def d1_insert_batch(records: List[Dict], returning: bool = False) -> Dict:
     """
     Insert a batch of COLA records into D1 using bulk INSERT OR IGNORE.
 
-    Uses inline SQL values to avoid SQLite parameter limit (~999).
+    Rows are packed into multi-row INSERT ... VALUES (...),(...) statements,
+    each kept under D1's statement size limit, and all statements for the
+    batch go to D1 in a single request. Uses inline SQL values to avoid the
+    SQLite parameter limit (~999).
 
     Args:
         records: List of COLA record dicts
+        returning: If True, add RETURNING ttb_id so the result lists exactly
+            which records were new (ignored duplicates return nothing)
 
     Returns:
-        Dict with 'success', 'inserted' count, and optionally 'error'
+        Dict with 'success', 'inserted' count, 'inserted_ids' (if returning),
+        and optionally 'error'
     """
     if not records:
-        return {"success": True, "inserted": 0}
-
-    columns = [
-        'ttb_id', 'status', 'vendor_code', 'serial_number', 'class_type_code',
-        'origin_code', 'brand_name', 'fanciful_name', 'type_of_application',
-        'for_sale_in', 'total_bottle_capacity', 'formula', 'approval_date',
-        'qualifications', 'grape_varietal', 'wine_vintage', 'appellation',
-        'alcohol_content', 'ph_level', 'plant_registry', 'company_name',
-        'street', 'state', 'contact_person', 'phone_number', 'year', 'month', 'day',
-        'category'
-    ]
+        return {"success": True, "inserted": 0, "inserted_ids": []} if returning else {"success": True, "inserted": 0}
 
-    columns_str = ', '.join(columns)
+    prefix = _COLA_INSERT_PREFIX
+    suffix = " RETURNING ttb_id;" if returning else ";"
+    prefix_bytes = _COLA_INSERT_PREFIX_BYTES + len(suffix)
 
     statements = []
+    rows = []
+    stmt_bytes = prefix_bytes
     for record in records:
         # Get values for all columns except category (which we compute)
-        values = [escape_sql_value(record.get(col)) for col in columns[:-1]]
+        values = [escape_sql_value(record.get(col)) for col in COLA_RECORD_COLUMNS]
         # Add category based on class_type_code
         category = classify_category(record.get('class_type_code', ''))
         values.append(escape_sql_value(category))
-        values_str = ', '.join(values)
-        statements.append(f"INSERT OR IGNORE INTO colas ({columns_str}) VALUES ({values_str});")
+        row = f"({', '.join(values)})"
+        row_bytes = len(row.encode('utf-8')) + 1  # + separating comma
+        # Start a new statement before this one would go over the size limit
+        if rows and stmt_bytes + row_bytes > D1_MAX_STATEMENT_BYTES:
+            statements.append(prefix + ','.join(rows) + suffix)
+            rows = []
+            stmt_bytes = prefix_bytes
+        rows.append(row)
+        stmt_bytes += row_bytes
+    statements.append(prefix + ','.join(rows) + suffix)
 
     sql = '\n'.join(statements)
     result = d1_execute(sql)
 
     if result.get("success"):
+        if returning:
+            inserted_ids = [row.get("ttb_id") for res in result.get("result", []) for row in res.get("results", [])]
+            return {"success": True, "inserted": len(inserted_ids), "inserted_ids": inserted_ids}
         total_changes = 0
         for res in result.get("result", []):
             total_changes += res.get("meta", {}).get("changes", 0)
@@ -236,10 +358,13 @@ def d1_insert_batch(records: List[Dict]) -> Dict:
 # SLUG AND BRAND FUNCTIONS
 # =============================================================================
 
+@lru_cache(maxsize=50_000)
 def make_slug(text: str) -> str:
     """
     Convert brand or company name to URL-safe slug.
 
+    Memoized: brand and company names repeat heavily across records.
+
     Args:
         text: Brand or company name
 
@@ -256,13 +381,15 @@ def make_slug(text: str) -> str:
     return text
 
 
-def update_brand_slugs(records: List[Dict], dry_run: bool = False) -> int:
+def update_brand_slugs(records: List[Dict], dry_run: bool = False,
+                       unique_brands: Optional[Iterable[str]] = None) -> int:
     """
     Add new brand names to brand_slugs table for SEO page lookups.
 
     Args:
         records: List of COLA records containing brand_name
         dry_run: If True, skip actual insert
+        unique_brands: Optional pre-deduplicated brand names; skips the scan of records
 
     Returns:
         Number of new brands added
@@ -272,11 +399,14 @@ def update_brand_slugs(records: List[Dict], dry_run: bool = False) -> int:
     if not records:
         return 0
 
-    brand_names = set()
-    for record in records:
-        brand_name = record.get('brand_name')
-        if brand_name:
-            brand_names.add(brand_name)
+    if unique_brands is not None:
+        brand_names = {b for b in unique_brands if b}
+    else:
+        brand_names = set()
+        for record in records:
+            brand_name = record.get('brand_name')
+            if brand_name:
+                brand_names.add(brand_name)
 
     if not brand_names:
         return 0
@@ -296,16 +426,32 @@ def update_brand_slugs(records: List[Dict], dry_run: bool = False) -> int:
     if not values:
         return 0
 
-    total_inserted = 0
-    batch_size = _config['batch_size']
+    # Multi-row statements kept under D1's statement size limit, one request
+    # each; RETURNING lists only the slugs that were actually new
+    prefix = "INSERT OR IGNORE INTO brand_slugs (slug, brand_name, filing_count) VALUES "
+    suffix = " RETURNING slug"
+    prefix_bytes = len(prefix) + len(suffix)
+    statements = []
+    rows = []
+    stmt_bytes = prefix_bytes
+    for row in values:
+        row_bytes = len(row.encode('utf-8')) + 1  # + separating comma
+        if rows and stmt_bytes + row_bytes > D1_MAX_STATEMENT_BYTES:
+            statements.append(prefix + ','.join(rows) + suffix)
+            rows = []
+            stmt_bytes = prefix_bytes
+        rows.append(row)
+        stmt_bytes += row_bytes
+    statements.append(prefix + ','.join(rows) + suffix)
 
-    for i in range(0, len(values), batch_size):
-        batch = values[i:i + batch_size]
-        sql = f"INSERT OR IGNORE INTO brand_slugs (slug, brand_name, filing_count) VALUES {','.join(batch)}"
-        result = d1_execute(sql)
-        if result.get("success"):
-            for res in result.get("result", []):
-                total_inserted += res.get("meta", {}).get("changes", 0)
+    total_inserted = 0
+    for i, statement in enumerate(statements, 1):
+        results = d1_execute_many([statement])
+        if not results:
+            # Brands missed here are picked up again by the next sync
+            logger.error(f"brand_slugs chunk {i}/{len(statements)} failed; continuing")
+            continue
+        total_inserted += len(results[0])
 
     logger.info(f"Added {total_inserted} new brands to brand_slugs")
     return total_inserted
@@ -366,7 +512,8 @@ def normalize_company_name(company_name: str) -> str:
     return name
 
 
-def add_new_companies(records: List[Dict], dry_run: bool = False) -> int:
+def add_new_companies(records: List[Dict], dry_run: bool = False,
+                      unique_companies: Optional[Iterable[str]] = None) -> int:
     """
     Add new companies to companies and company_aliases tables.
 
@@ -376,6 +523,7 @@ def add_new_companies(records: List[Dict], dry_run: bool = False) -> int:
     Args:
         records: List of COLA records containing company_name
         dry_run: If True, skip actual insert
+        unique_companies: Optional pre-deduplicated company names; skips the scan of records
 
     Returns:
         Number of new companies added
@@ -386,28 +534,39 @@ def add_new_companies(records: List[Dict], dry_run: bool = False) -> int:
         return 0
 
     # Get unique company names from records
-    company_names = set()
-    for record in records:
-        company_name = record.get('company_name')
-        if company_name and company_name.strip():
-            company_names.add(company_name.strip())
+    if unique_companies is not None:
+        company_names = {n.strip() for n in unique_companies if n and n.strip()}
+    else:
+        company_names = set()
+        for record in records:
+            company_name = record.get('company_name')
+            if company_name and company_name.strip():
+                company_names.add(company_name.strip())
 
     if not company_names:
         return 0
 
-    # Check which companies already exist in company_aliases (case-insensitive)
+    # Check which companies already exist in company_aliases (case-insensitive),
+    # fetching the current max company ID in the same request
     existing = set()
     existing_upper = set()  # Track uppercase versions for case-insensitive matching
-    for i in range(0, len(company_names), 100):
-        batch = list(company_names)[i:i + 100]
-        placeholders = ','.join([escape_sql_value(n.upper()) for n in batch])
-        result = d1_execute(f"SELECT raw_name FROM company_aliases WHERE UPPER(raw_name) IN ({placeholders})")
-        if result.get("success") and result.get("result"):
-            for res in result.get("result", []):
-                for row in res.get("results", []):
-                    raw = row.get("raw_name")
-                    existing.add(raw)
-                    existing_upper.add(raw.upper())
+    names = list(company_names)
+    lookups = [
+        "SELECT raw_name FROM company_aliases WHERE UPPER(raw_name) IN "
+        f"({','.join(escape_sql_value(n.upper()) for n in names[i:i + 100])})"
+        for i in range(0, len(names), 100)
+    ]
+    results = d1_execute_many(lookups + ["SELECT MAX(id) as max_id FROM companies"])
+    if len(results) != len(lookups) + 1:
+        # Without the alias lookups and max ID, every name would look new and get
+        # IDs that collide with existing companies
+        logger.error("Company lookup failed; skipping company update")
+        return 0
+    for rows in results[:len(lookups)]:
+        for row in rows:
+            raw = row.get("raw_name")
+            existing.add(raw)
+            existing_upper.add(raw.upper())
 
     # Filter to only new companies (case-insensitive check)
     new_companies = {n for n in company_names if n.upper() not in existing_upper}
@@ -417,13 +576,10 @@ def add_new_companies(records: List[Dict], dry_run: bool = False) -> int:
 
     logger.info(f"Adding {len(new_companies)} new companies to database...")
 
-    # Get current max company ID
-    result = d1_execute("SELECT MAX(id) as max_id FROM companies")
+    # Get current max company ID (last statement of the lookup request)
     max_id = 0
-    if result.get("success") and result.get("result"):
-        for res in result.get("result", []):
-            for row in res.get("results", []):
-                max_id = row.get("max_id") or 0
+    for row in results[-1]:
+        max_id = row.get("max_id") or 0
 
     total_inserted = 0
     next_id = max_id + 1
@@ -438,14 +594,19 @@ def add_new_companies(records: List[Dict], dry_run: bool = False) -> int:
 
     # Check which normalized names already exist in companies table
     existing_normalized = {}  # normalized_name -> company_id
-    for i in range(0, len(normalized_names), 100):
-        batch = list(normalized_names)[i:i + 100]
-        placeholders = ','.join([escape_sql_value(n.upper()) for n in batch])
-        result = d1_execute(f"SELECT id, canonical_name FROM companies WHERE match_key IN ({placeholders})")
-        if result.get("success") and result.get("result"):
-            for res in result.get("result", []):
-                for row in res.get("results", []):
-                    existing_normalized[row.get("canonical_name", "").upper()] = row.get("id")
+    normalized_list = list(normalized_names)
+    lookups = [
+        "SELECT id, canonical_name FROM companies WHERE match_key IN "
+        f"({','.join(escape_sql_value(n.upper()) for n in normalized_list[i:i + 100])})"
+        for i in range(0, len(normalized_list), 100)
+    ]
+    results = d1_execute_many(lookups)
+    if len(results) != len(lookups):
+        logger.error("Company match_key lookup failed; skipping company update")
+        return 0
+    for rows in results:
+        for row in rows:
+            existing_normalized[row.get("canonical_name", "").upper()] = row.get("id")
 
     # Insert in batches
     for i in range(0, len(new_companies), 100):
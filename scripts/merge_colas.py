@@ -132,11 +132,6 @@ def merge_databases(source_dbs: List[str], output_path: str):
             source_db TEXT,
             scraped_at TEXT
         );
-        
-        CREATE INDEX IF NOT EXISTS idx_links_ttb ON collected_links(ttb_id);
-        CREATE INDEX IF NOT EXISTS idx_colas_ttb ON colas(ttb_id);
-        CREATE INDEX IF NOT EXISTS idx_colas_date ON colas(approval_date);
-        CREATE INDEX IF NOT EXISTS idx_colas_ym ON colas(year, month);
     """)
     out.commit()
     
@@ -169,7 +164,7 @@ def merge_databases(source_dbs: List[str], output_path: str):
                 for row in rows:
                     try:
                         r = dict(zip(col_names, row))
-                        out.execute("""
+                        cur = out.execute("""
                             INSERT OR IGNORE INTO collected_links
                             (ttb_id, detail_url, year, month, scraped, source_db, collected_at)
                             VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -179,7 +174,7 @@ def merge_databases(source_dbs: List[str], output_path: str):
                             r.get('scraped', 0), db_path,
                             r.get('collected_at')
                         ))
-                        if out.execute("SELECT changes()").fetchone()[0] > 0:
+                        if cur.rowcount > 0:
                             links_added += 1
                     except:
                         pass
@@ -195,7 +190,7 @@ def merge_databases(source_dbs: List[str], output_path: str):
                         # Convert row to dict
                         r = dict(zip(col_names, row))
                         
-                        out.execute("""
+                        cur = out.execute("""
                             INSERT OR IGNORE INTO colas
                             (ttb_id, status, vendor_code, serial_number, class_type_code,
                              origin_code, brand_name, fanciful_name, type_of_application,
@@ -221,7 +216,7 @@ def merge_databases(source_dbs: List[str], output_path: str):
                             r.get('year'), r.get('month'), db_path,
                             r.get('scraped_at')
                         ))
-                        if out.execute("SELECT changes()").fetchone()[0] > 0:
+                        if cur.rowcount > 0:
                             colas_added += 1
                     except Exception as e:
                         if colas_added == 0:
@@ -238,6 +233,12 @@ def merge_databases(source_dbs: List[str], output_path: str):
         except Exception as e:
             print(f"  WARNING  Error: {e}")
     
+    # Build secondary indexes once, after the bulk load (ttb_id lookups use the
+    # UNIQUE constraint's own index)
+    out.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_colas_date ON colas(approval_date);
+        CREATE INDEX IF NOT EXISTS idx_colas_ym ON colas(year, month);
+    """)
     out.close()
     
     print(f"\n{'='*60}")
@@ -119,11 +119,11 @@ def merge_database(source_db_path):
         placeholders = ['?' for _ in columns_to_insert]
         
         try:
-            dest_conn.execute(
+            cur = dest_conn.execute(
                 f"INSERT OR IGNORE INTO colas ({', '.join(columns_to_insert)}) VALUES ({', '.join(placeholders)})",
                 values
             )
-            if dest_conn.total_changes > inserted + skipped:
+            if cur.rowcount > 0:
                 inserted += 1
             else:
                 skipped += 1
@@ -21,20 +21,35 @@ USAGE:
 """
 
 import os
+import time
 import argparse
+import hashlib
 import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import chain, islice
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import numpy as np
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.ticker import MaxNLocator
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
+try:
+    import pyarrow  # noqa: F401 - Parquet engine for the data cache
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from reportlab import rl_config
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, white
@@ -58,6 +73,31 @@ ENV_FILE = str(BASE_DIR / ".env")
 OUTPUT_DIR = str(BASE_DIR / "reports")
 LOG_FILE = str(BASE_DIR / "logs" / "weekly_report.log")
 LOGO_PATH = str(BASE_DIR / "Logo.jpg")
+CACHE_DIR = str(BASE_DIR / "cache")
+
+# Reuse a cached historical pull if it is younger than this
+CACHE_MAX_AGE_HOURS = 24
+
+# Chart resolution: PDF figures keep print quality; the standalone (web/email)
+# charts don't gain visibly above ~120 dpi and Agg cost grows with dpi squared
+CHART_DPI = 200
+WEB_CHART_DPI = 120
+
+# Write buffer for the finished PDF (1 MiB), so it reaches disk in a few large writes
+PDF_WRITE_BUFFER = 1 << 20
+
+# Part of every cached chart's key; bump when chart rendering changes so stale PNGs are not reused
+CHART_CACHE_VERSION = 1
+
+# Concurrent D1 requests and rows per request when paginating large pulls
+D1_FETCH_WORKERS = 8
+D1_PAGE_SIZE = 50000
+
+# Shared HTTP session: keeps TLS connections to the D1 API alive across queries
+# (pool sized for the concurrent page fetches) and asks for gzip'd JSON.
+_SESSION = requests.Session()
+_SESSION.headers["Accept-Encoding"] = "gzip"
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
 COLORS = {
     "primary": "#0d9488",
@@ -71,6 +111,12 @@ COLORS = {
     "orange": "#f59e0b",
 }
 
+# ReportLab color objects, parsed once (HexColor re-parses the string on every call)
+PDF_COLORS = {name: HexColor(value) for name, value in COLORS.items()}
+ROW_STRIPES = [HexColor("#ffffff"), HexColor("#f9fafb")]
+CTA_BG = HexColor("#f0fdfa")
+UPGRADE_BG = HexColor("#f8fafc")
+
 # =============================================================================
 # EXACT TTB_CODE_CATEGORIES FROM database.js
 # =============================================================================
@@ -189,6 +235,60 @@ TTB_CODE_CATEGORIES = {
 }
 
 CATEGORY_ORDER = ['Whiskey', 'Vodka', 'Wine', 'Beer', 'Tequila', 'RTD', 'Rum', 'Gin', 'Brandy', 'Liqueur', 'Other']
+CATEGORY_DTYPE = pd.CategoricalDtype(categories=CATEGORY_ORDER, ordered=True)
+CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORY_ORDER)}
+
+# SQL expression mapping class_type_code -> index into CATEGORY_ORDER, so D1
+# does the category lookup and returns a small int instead of the code string.
+# 'Other' codes are left to the ELSE branch. SQLite's TRIM only removes spaces by
+# default, so tabs, CRs and LFs are listed to match the str.strip() lookup.
+CATEGORY_CODE_SQL = (
+    "CASE UPPER(TRIM(class_type_code, ' ' || char(9) || char(10) || char(13))) "
+    + " ".join(
+        f"WHEN '{code.replace(chr(39), chr(39) * 2)}' THEN {CATEGORY_INDEX[cat]}"
+        for code, cat in TTB_CODE_CATEGORIES.items() if cat != 'Other'
+    )
+    + f" ELSE {CATEGORY_INDEX['Other']} END"
+)
+
+# Columns pulled from D1 for the chart/metrics window (order = SELECT order).
+# company/brand/fanciful/class_type_code make up the SKU key; ttb_id, origin_code
+# and signal feed the teaser tables, origin chart and newness counts;
+# year/month/day are only needed to build approval_date.
+CHART_COLUMNS = (
+    "ttb_id", "brand_name", "fanciful_name", "class_type_code", "origin_code",
+    "company_name", "year", "month", "day", "signal",
+)
+
+# Origins counted as domestic in the origin mix chart (origin_code, upper-cased)
+US_STATES = frozenset({'ALABAMA', 'ALASKA', 'ARIZONA', 'ARKANSAS', 'CALIFORNIA', 'COLORADO', 'CONNECTICUT',
+                       'DELAWARE', 'FLORIDA', 'GEORGIA', 'HAWAII', 'IDAHO', 'ILLINOIS', 'INDIANA', 'IOWA',
+                       'KANSAS', 'KENTUCKY', 'LOUISIANA', 'MAINE', 'MARYLAND', 'MASSACHUSETTS', 'MICHIGAN',
+                       'MINNESOTA', 'MISSISSIPPI', 'MISSOURI', 'MONTANA', 'NEBRASKA', 'NEVADA', 'NEW HAMPSHIRE',
+                       'NEW JERSEY', 'NEW MEXICO', 'NEW YORK', 'NORTH CAROLINA', 'NORTH DAKOTA', 'OHIO',
+                       'OKLAHOMA', 'OREGON', 'PENNSYLVANIA', 'RHODE ISLAND', 'SOUTH CAROLINA', 'SOUTH DAKOTA',
+                       'TENNESSEE', 'TEXAS', 'UTAH', 'VERMONT', 'VIRGINIA', 'WASHINGTON', 'WEST VIRGINIA',
+                       'WISCONSIN', 'WYOMING', 'DISTRICT OF COLUMBIA', 'PUERTO RICO', 'VIRGIN ISLANDS'})
+
+# State/Country abbreviations for the Pro teaser table's origin column
+ORIGIN_ABBREV = {
+    'ALABAMA': 'AL', 'ALASKA': 'AK', 'ARIZONA': 'AZ', 'ARKANSAS': 'AR', 'CALIFORNIA': 'CA',
+    'COLORADO': 'CO', 'CONNECTICUT': 'CT', 'DELAWARE': 'DE', 'FLORIDA': 'FL', 'GEORGIA': 'GA',
+    'HAWAII': 'HI', 'IDAHO': 'ID', 'ILLINOIS': 'IL', 'INDIANA': 'IN', 'IOWA': 'IA',
+    'KANSAS': 'KS', 'KENTUCKY': 'KY', 'LOUISIANA': 'LA', 'MAINE': 'ME', 'MARYLAND': 'MD',
+    'MASSACHUSETTS': 'MA', 'MICHIGAN': 'MI', 'MINNESOTA': 'MN', 'MISSISSIPPI': 'MS', 'MISSOURI': 'MO',
+    'MONTANA': 'MT', 'NEBRASKA': 'NE', 'NEVADA': 'NV', 'NEW HAMPSHIRE': 'NH', 'NEW JERSEY': 'NJ',
+    'NEW MEXICO': 'NM', 'NEW YORK': 'NY', 'NORTH CAROLINA': 'NC', 'NORTH DAKOTA': 'ND', 'OHIO': 'OH',
+    'OKLAHOMA': 'OK', 'OREGON': 'OR', 'PENNSYLVANIA': 'PA', 'RHODE ISLAND': 'RI', 'SOUTH CAROLINA': 'SC',
+    'SOUTH DAKOTA': 'SD', 'TENNESSEE': 'TN', 'TEXAS': 'TX', 'UTAH': 'UT', 'VERMONT': 'VT',
+    'VIRGINIA': 'VA', 'WASHINGTON': 'WA', 'WEST VIRGINIA': 'WV', 'WISCONSIN': 'WI', 'WYOMING': 'WY',
+    'DISTRICT OF COLUMBIA': 'DC', 'PUERTO RICO': 'PR',
+    # Countries
+    'FRANCE': 'FR', 'SPAIN': 'ES', 'ITALY': 'IT', 'GERMANY': 'DE', 'UNITED KINGDOM': 'UK',
+    'MEXICO': 'MX', 'CANADA': 'CA', 'AUSTRALIA': 'AU', 'ARGENTINA': 'AR', 'CHILE': 'CL',
+    'IRELAND': 'IE', 'SCOTLAND': 'SCO', 'JAPAN': 'JP', 'NEW ZEALAND': 'NZ', 'SOUTH AFRICA': 'ZA',
+    'PORTUGAL': 'PT', 'NETHERLANDS': 'NL', 'BELGIUM': 'BE', 'AUSTRIA': 'AT', 'GREECE': 'GR',
+}
 
 # Logging setup
 os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
@@ -199,6 +299,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Output directories already created by this process
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path: str) -> str:
+    """os.makedirs(path, exist_ok=True), skipped for directories this process already made."""
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
+
 
 # =============================================================================
 # DATA LOADING
@@ -215,14 +326,28 @@ def load_env():
                     os.environ[key.strip()] = value.strip().strip('"').strip("'")
 
 
-def get_category(class_type_code) -> str:
-    """Map TTB class/type code to category using exact lookup."""
-    if class_type_code is None or (isinstance(class_type_code, float) and pd.isna(class_type_code)):
-        return 'Other'
-    if not isinstance(class_type_code, str):
-        return 'Other'
-    code = class_type_code.strip().upper()
-    return TTB_CODE_CATEGORIES.get(code, 'Other')
+def _downcast_date_parts(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink year/month/day from int64 to the smallest unsigned int (uint16/uint8)."""
+    for col in ("year", "month", "day"):
+        df[col] = pd.to_numeric(df[col], downcast="unsigned")
+    return df
+
+
+def _category_from_codes(codes: pd.Series) -> pd.Categorical:
+    """Turn CATEGORY_CODE_SQL indexes back into the ordered category column."""
+    return pd.Categorical.from_codes(codes.to_numpy(dtype=np.int8), dtype=CATEGORY_DTYPE)
+
+
+def _dates_from_parts(df: pd.DataFrame) -> pd.Series:
+    """Build dates from D1's integer year/month/day columns (invalid parts -> NaT)."""
+    return pd.to_datetime(df[["year", "month", "day"]], errors="coerce")
+
+
+def _week_start(dates: pd.Series) -> pd.Series:
+    """Monday of each date's Mon-Sun week (same as to_period("W-SUN").start_time)."""
+    days = dates.to_numpy().astype("datetime64[D]")
+    weekday = dates.dt.weekday.to_numpy()
+    return pd.Series(days - weekday.astype("timedelta64[D]"), index=dates.index)
 
 
 def d1_query(sql: str) -> List[Dict]:
@@ -239,14 +364,16 @@ def d1_query(sql: str) -> List[Dict]:
     url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/d1/database/{database_id}/query"
     headers = {"Authorization": f"Bearer {api_token}", "Content-Type": "application/json"}
 
-    resp = requests.post(url, headers=headers, json={"sql": sql})
+    resp = _SESSION.post(url, headers=headers, json={"sql": sql})
     resp.raise_for_status()
-    data = resp.json()
+    # D1 batches can be tens of MB of JSON; orjson parses the raw bytes much faster
+    data = orjson.loads(resp.content) if HAS_ORJSON else resp.json()
 
     if not data.get("success"):
         raise RuntimeError(f"D1 query failed: {data}")
 
-    return data.get("result", [{}])[0].get("results", [])
+    result = data.get("result")
+    return result[0].get("results", []) if result else []
 
 
 def fetch_week_data(week_start: datetime, week_end: datetime) -> pd.DataFrame:
@@ -256,24 +383,31 @@ def fetch_week_data(week_start: datetime, week_end: datetime) -> pd.DataFrame:
     end_str = week_end.strftime("%m/%d/%Y")
 
     # Query for this week's records - use year/month/day for efficient indexed lookup
+    if week_start.month == week_end.month:
+        month_filter = f"month = {week_end.month} AND day BETWEEN {week_start.day} AND {week_end.day}"
+    else:
+        month_filter = f"""(
+            (month = {week_start.month} AND day >= {week_start.day})
+            OR (month = {week_end.month} AND day <= {week_end.day})
+            OR (month > {week_start.month} AND month < {week_end.month})
+        )"""
+
     query = f"""
         SELECT ttb_id, brand_name, fanciful_name, class_type_code, origin_code,
-               approval_date, status, company_name, year, month, day, signal
+               status, company_name, year, month, day, signal,
+               {CATEGORY_CODE_SQL} AS category_code
         FROM colas
         WHERE status = 'APPROVED'
         AND year = {week_end.year}
-        AND (
-            (month = {week_start.month} AND day >= {week_start.day})
-            OR (month = {week_end.month} AND day <= {week_end.day})
-            OR (month > {week_start.month} AND month < {week_end.month})
-        )
+        AND {month_filter}
     """
 
     # Handle year boundary (e.g., week spanning Dec-Jan)
     if week_start.year != week_end.year:
         query = f"""
             SELECT ttb_id, brand_name, fanciful_name, class_type_code, origin_code,
-                   approval_date, status, company_name, year, month, day, signal
+                   status, company_name, year, month, day, signal,
+                   {CATEGORY_CODE_SQL} AS category_code
             FROM colas
             WHERE status = 'APPROVED'
             AND (
@@ -288,15 +422,17 @@ def fetch_week_data(week_start: datetime, week_end: datetime) -> pd.DataFrame:
     if not results:
         return pd.DataFrame()
 
-    df = pd.DataFrame(results)
-    df["approval_date"] = pd.to_datetime(df["approval_date"], format="%m/%d/%Y", errors="coerce")
+    df = _downcast_date_parts(pd.DataFrame(results))
+    df["approval_date"] = _dates_from_parts(df)
     df = df.dropna(subset=["approval_date"])
 
     # Filter to exact date range (in case query was broader)
     df = df[(df["approval_date"] >= week_start) & (df["approval_date"] <= week_end)]
+    if df.empty:
+        return df
 
-    df["category"] = df["class_type_code"].apply(get_category)
-    df["week"] = df["approval_date"].dt.to_period("W-SUN").dt.start_time
+    df["category"] = _category_from_codes(df.pop("category_code"))
+    df["week"] = _week_start(df["approval_date"])
 
     return df
 
@@ -305,13 +441,20 @@ def fetch_daily_aggregates(years_back: int = 3) -> pd.DataFrame:
     """Fetch daily aggregate counts for rolling averages (much faster than full data)."""
     min_year = datetime.now().year - years_back
 
+    # Group on the SKU columns themselves rather than COUNT(DISTINCT a || '|' || b ...),
+    # so D1 doesn't build and dedupe a concatenated string for every row.
+    # SKUs with a NULL company/brand are left out of unique_skus, as before.
     query = f"""
         SELECT year, month, day,
-               COUNT(*) as total_count,
-               COUNT(DISTINCT company_name || '|' || brand_name || '|' ||
-                     COALESCE(fanciful_name, '') || '|' || COALESCE(class_type_code, '')) as unique_skus
-        FROM colas
-        WHERE status = 'APPROVED' AND year >= {min_year}
+               SUM(n) as total_count,
+               SUM(company_name IS NOT NULL AND brand_name IS NOT NULL) as unique_skus
+        FROM (
+            SELECT year, month, day, company_name, brand_name, COUNT(*) as n
+            FROM colas
+            WHERE status = 'APPROVED' AND year >= {min_year}
+            GROUP BY year, month, day, company_name, brand_name,
+                     COALESCE(fanciful_name, ''), COALESCE(class_type_code, '')
+        )
         GROUP BY year, month, day
         ORDER BY year, month, day
     """
@@ -322,18 +465,12 @@ def fetch_daily_aggregates(years_back: int = 3) -> pd.DataFrame:
     if not results:
         return pd.DataFrame()
 
-    df = pd.DataFrame(results)
-
-    # Build date column
-    df["date"] = pd.to_datetime(
-        df["year"].astype(str) + "-" + df["month"].astype(str).str.zfill(2) + "-" + df["day"].astype(str).str.zfill(2),
-        format="%Y-%m-%d",
-        errors="coerce"
-    )
+    df = _downcast_date_parts(pd.DataFrame(results))
+    df["date"] = _dates_from_parts(df)
     df = df.dropna(subset=["date"])
 
     # Add week column (Monday-based, ending Sunday)
-    df["week"] = df["date"].dt.to_period("W-SUN").dt.start_time
+    df["week"] = _week_start(df["date"])
 
     return df
 
@@ -343,11 +480,13 @@ def fetch_category_aggregates(week_start: datetime, week_end: datetime, weeks_ba
     lookback_start = week_start - timedelta(weeks=weeks_back)
     min_year = lookback_start.year
 
+    # Group on the category index rather than the raw code so D1 returns one
+    # row per category/day instead of one per class_type_code/day.
     query = f"""
-        SELECT class_type_code, year, month, day, COUNT(*) as count
+        SELECT {CATEGORY_CODE_SQL} as category_code, year, month, day, COUNT(*) as count
         FROM colas
         WHERE status = 'APPROVED' AND year >= {min_year}
-        GROUP BY class_type_code, year, month, day
+        GROUP BY category_code, year, month, day
     """
 
     results = d1_query(query)
@@ -356,15 +495,11 @@ def fetch_category_aggregates(week_start: datetime, week_end: datetime, weeks_ba
     if not results:
         return pd.DataFrame()
 
-    df = pd.DataFrame(results)
-    df["date"] = pd.to_datetime(
-        df["year"].astype(str) + "-" + df["month"].astype(str).str.zfill(2) + "-" + df["day"].astype(str).str.zfill(2),
-        format="%Y-%m-%d",
-        errors="coerce"
-    )
+    df = _downcast_date_parts(pd.DataFrame(results))
+    df["date"] = _dates_from_parts(df)
     df = df.dropna(subset=["date"])
-    df["category"] = df["class_type_code"].apply(get_category)
-    df["week"] = df["date"].dt.to_period("W-SUN").dt.start_time
+    df["category"] = _category_from_codes(df.pop("category_code"))
+    df["week"] = _week_start(df["date"])
 
     return df
 
@@ -374,50 +509,84 @@ def fetch_recent_data_for_charts(weeks_back: int = 130) -> pd.DataFrame:
     cutoff = datetime.now() - timedelta(weeks=weeks_back)
     min_year = cutoff.year
 
-    # Paginate to get all records for chart period
-    all_results = []
-    offset = 0
-    batch_size = 50000
-
-    while True:
-        query = f"""
-            SELECT ttb_id, brand_name, fanciful_name, class_type_code, origin_code,
-                   approval_date, company_name, year, month, day, signal
-            FROM colas
-            WHERE status = 'APPROVED' AND year >= {min_year}
-            ORDER BY year DESC, month DESC, day DESC
-            LIMIT {batch_size} OFFSET {offset}
-        """
-
-        results = d1_query(query)
-        if not results:
-            break
-
-        all_results.extend(results)
-        logger.info(f"Fetched batch: {len(results)} records (total: {len(all_results)})")
-
-        if len(results) < batch_size:
-            break
-        offset += batch_size
+    where = f"""
+        status = 'APPROVED' AND year >= {min_year}
+        AND (year > {min_year} OR month > {cutoff.month} OR (month = {cutoff.month} AND day >= {cutoff.day}))
+    """
 
-    if not all_results:
+    # Per-month counts let us split the window into contiguous month ranges of
+    # about one page each; ranges are fetched concurrently.
+    month_counts = d1_query(f"""
+        SELECT year, month, COUNT(*) AS n
+        FROM colas
+        WHERE {where}
+        GROUP BY year, month
+        ORDER BY year DESC, month DESC
+    """)
+    expected = sum(int(r["n"]) for r in month_counts)
+
+    ranges = []  # [newest (year, month), oldest (year, month), rows]
+    for r in month_counts:
+        ym, n = (int(r["year"]), int(r["month"])), int(r["n"])
+        if ranges and ranges[-1][2] + n <= D1_PAGE_SIZE:
+            ranges[-1][1] = ym
+            ranges[-1][2] += n
+        else:
+            ranges.append([ym, ym, n])
+
+    def fetch_range(month_range) -> List[Dict]:
+        (hi_year, hi_month), (lo_year, lo_month), _ = month_range
+        rows = []
+        seek = ""
+        while True:
+            results = d1_query(f"""
+                SELECT {", ".join(CHART_COLUMNS)}, {CATEGORY_CODE_SQL} AS category_code
+                FROM colas
+                WHERE {where}
+                AND (year, month) BETWEEN ({lo_year}, {lo_month}) AND ({hi_year}, {hi_month})
+                {seek}
+                ORDER BY year DESC, month DESC, day DESC, ttb_id DESC
+                LIMIT {D1_PAGE_SIZE}
+            """)
+            rows.extend(results)
+            if len(results) < D1_PAGE_SIZE:
+                return rows
+            # Keyset pagination: resume strictly after the last row instead of OFFSET
+            last = results[-1]
+            last_ttb_id = str(last["ttb_id"]).replace("'", "''")
+            seek = (f"AND (year, month, day, ttb_id) < "
+                    f"({last['year']}, {last['month']}, {last['day']}, '{last_ttb_id}')")
+
+    # Rows are appended column-wise as batches arrive so we never hold a
+    # list of per-row dicts for the whole window.
+    cols = {col: [] for col in CHART_COLUMNS + ("category_code",)}
+    total = 0
+
+    with ThreadPoolExecutor(max_workers=D1_FETCH_WORKERS) as executor:
+        for results in executor.map(fetch_range, ranges):
+            for col, values in cols.items():
+                values.extend(row.get(col) for row in results)
+            total += len(results)
+            logger.info(f"Fetched batch: {len(results)} records (total: {total:,} of {expected:,})")
+
+    if not total:
         return pd.DataFrame()
 
-    df = pd.DataFrame(all_results)
-    df["approval_date"] = pd.to_datetime(df["approval_date"], format="%m/%d/%Y", errors="coerce")
-    df = df.dropna(subset=["approval_date"])
+    df = pd.DataFrame(cols, copy=False)
+    df["approval_date"] = _dates_from_parts(df)
+    df = df.drop(columns=["year", "month", "day"]).dropna(subset=["approval_date"])
 
-    # Filter to exact date range
+    # Trim the partial cutoff day (SQL filter is day-granular)
     df = df[df["approval_date"] >= cutoff]
 
-    df["week"] = df["approval_date"].dt.to_period("W-SUN").dt.start_time
-    df["category"] = df["class_type_code"].apply(get_category)
+    df["week"] = _week_start(df["approval_date"])
+    df["category"] = _category_from_codes(df.pop("category_code"))
 
     logger.info(f"Fetched {len(df):,} records for charts (last {weeks_back} weeks)")
     return df
 
 
-def fetch_historical_data() -> pd.DataFrame:
+def fetch_historical_data(use_cache: bool = True) -> pd.DataFrame:
     """
     OPTIMIZED: Fetch data needed for the weekly report.
 
@@ -425,16 +594,40 @@ def fetch_historical_data() -> pd.DataFrame:
     (~300-600k records for charts and metrics).
 
     This reduces fetch time from ~12 minutes to ~2-3 minutes.
+
+    The result is cached as Parquet under CACHE_DIR (keyed by the report
+    week's end date) so re-runs within CACHE_MAX_AGE_HOURS skip the D1 pull.
     """
     load_env()
 
+    weeks_back = 130
+    _, week_end = last_complete_week(datetime.now())
+    cache_path = os.path.join(CACHE_DIR, f"colas_{week_end:%Y%m%d}.parquet")
+    use_cache = use_cache and HAS_PYARROW
+
+    if use_cache and os.path.exists(cache_path):
+        age_hours = (time.time() - os.path.getmtime(cache_path)) / 3600
+        if age_hours < CACHE_MAX_AGE_HOURS:
+            df = pd.read_parquet(cache_path)
+            logger.info(f"Loaded {len(df):,} records from cache ({cache_path})")
+            return df
+
     # Fetch recent data for charts (last 2.5 years = 130 weeks)
     # This is still needed for category trend charts which need raw data
-    df = fetch_recent_data_for_charts(weeks_back=130)
+    df = fetch_recent_data_for_charts(weeks_back=weeks_back)
 
     if df.empty:
         raise RuntimeError("No data fetched. Check D1 creds and database contents.")
 
+    if use_cache:
+        _ensure_dir(CACHE_DIR)
+        df.to_parquet(cache_path, compression="zstd", index=False)
+        logger.info(f"Cached records to {cache_path}")
+        # Pulls for earlier report weeks will never be read again
+        for stale in Path(CACHE_DIR).glob("colas_*.parquet"):
+            if str(stale) != cache_path:
+                stale.unlink()
+
     logger.info(f"Total records for report: {len(df):,}")
     return df
 
@@ -451,6 +644,69 @@ def last_complete_week(today: datetime) -> Tuple[datetime, datetime]:
     return week_start, week_end
 
 
+def _norm(s: pd.Series) -> pd.Series:
+    """Normalize a text column for key building (missing -> "", upper-cased, stripped)."""
+    if HAS_PYARROW:
+        # Arrow string kernels run natively; object-dtype .str methods loop in Python
+        s = s.astype("string[pyarrow]")
+    return s.fillna("").str.strip().str.upper()
+
+
+def _normalized(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of df with normalized text columns and SKU/brand keys attached.
+
+    _sku_hash is a 64-bit hash of the normalized (company, brand, fanciful,
+    class_type_code) tuple, used for all SKU dedupes and unique counts;
+    _brand_key is the company|brand string (it also orders the brand chart). Metrics and charts read these
+    instead of re-normalizing the raw columns. The low-cardinality raw columns
+    are converted to category dtype in the copy so groupbys hash int codes.
+    The caller's frame is left unchanged; a frame that already carries the keys
+    is returned as-is, so generate_report normalizes once and passes it down.
+    """
+    if "_sku_hash" in df.columns:
+        return df
+    df = df.copy(deep=False)  # new columns/dtypes go to the copy only
+    df["_co_n"] = _norm(df["company_name"])
+    df["_br_n"] = _norm(df["brand_name"])
+    df["_fn_n"] = _norm(df["fanciful_name"])
+    df["_ct_n"] = _norm(df["class_type_code"])
+    df["_orig_n"] = _norm(df["origin_code"])
+    df["_sku_hash"] = pd.util.hash_pandas_object(
+        df[["_co_n", "_br_n", "_fn_n", "_ct_n"]], index=False
+    ).to_numpy().view(np.int64)
+    df["_brand_key"] = df["_co_n"] + "|" + df["_br_n"]
+    df["_signal_n"] = _norm(df["signal"]).astype("category")
+    for col in ("origin_code", "class_type_code", "signal"):
+        df[col] = df[col].astype("category")
+    return df
+
+
+def _date_window(df: pd.DataFrame, start: datetime, end: datetime, include_end: bool = True) -> pd.DataFrame:
+    """
+    Rows with start <= approval_date <= end (or < end if include_end is False).
+
+    The chart fetch returns rows newest-first, so approval_date is normally
+    sorted and the window is found by binary search and taken as an iloc
+    slice; unsorted frames fall back to a boolean mask.
+    """
+    dates = df["approval_date"]
+    end_side = "right" if include_end else "left"
+    if dates.is_monotonic_increasing:
+        values = dates.to_numpy()
+        lo = values.searchsorted(np.datetime64(start), side="left")
+        hi = values.searchsorted(np.datetime64(end), side=end_side)
+        return df.iloc[lo:hi]
+    if dates.is_monotonic_decreasing:
+        values = dates.to_numpy()[::-1]
+        n = len(values)
+        lo = values.searchsorted(np.datetime64(start), side="left")
+        hi = values.searchsorted(np.datetime64(end), side=end_side)
+        return df.iloc[n - hi:n - lo]
+    upper = (dates <= end) if include_end else (dates < end)
+    return df[(dates >= start) & upper]
+
+
 def weekly_series(df: pd.DataFrame) -> pd.DataFrame:
     """Create weekly aggregation (total filings)."""
     w = df.groupby("week").size().reset_index(name="count").sort_values("week")
@@ -459,24 +715,30 @@ def weekly_series(df: pd.DataFrame) -> pd.DataFrame:
 
 def weekly_series_unique(df: pd.DataFrame) -> pd.DataFrame:
     """Create weekly aggregation based on unique SKUs (not total filings)."""
-    df = df.copy()
-    
-    # Create SKU key as a string for proper grouping
-    df["sku_key"] = (
-        df["company_name"].fillna("").str.upper().str.strip() + "|" +
-        df["brand_name"].fillna("").str.upper().str.strip() + "|" +
-        df["fanciful_name"].fillna("").str.upper().str.strip() + "|" +
-        df["class_type_code"].fillna("").str.upper().str.strip()
-    )
+    df = _normalized(df)
     
     # Count unique SKUs per week
-    w = df.groupby("week")["sku_key"].nunique().reset_index(name="count").sort_values("week")
+    w = df[["week", "_sku_hash"]].drop_duplicates().groupby("week").size().reset_index(name="count").sort_values("week")
     return w
 
 
 def rolling_mean(series: pd.Series, window: int) -> pd.Series:
-    """Compute rolling mean."""
-    return series.rolling(window=window, min_periods=window).mean()
+    """Compute rolling mean (NaN until a full window is available)."""
+    # Cumulative-sum differences: one pass over the weekly counts, no Rolling machinery
+    values = series.to_numpy(dtype=np.float64)
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    means = (csum[window:] - csum[:-window]) / window
+    head = np.full(min(window - 1, len(values)), np.nan)
+    return pd.Series(np.concatenate((head, means)), index=series.index)
+
+
+def _pace_stats(counts: np.ndarray) -> Tuple[float, float, float]:
+    """Average of the last 4 weeks, the 4 before that, and the same 4 weeks a year earlier (NaN if too short)."""
+    n = counts.size
+    last4_avg = float(counts[-4:].mean())
+    prior4_avg = float(counts[-8:-4].mean()) if n >= 8 else np.nan
+    last_year_avg = float(counts[-56:-52].mean()) if n >= 56 else np.nan
+    return last4_avg, prior4_avg, last_year_avg
 
 
 def compute_newness_metrics(df: pd.DataFrame, week_start: datetime, week_end: datetime) -> Dict:
@@ -494,106 +756,77 @@ def compute_newness_metrics(df: pd.DataFrame, week_start: datetime, week_end: da
 
     Returns top 10 for each category plus full row data for Pro teaser table.
     """
+    df = _normalized(df)
+
     # Filter to report week
-    week_df = df[(df["approval_date"] >= week_start) & (df["approval_date"] <= week_end)].copy()
+    week_df = _date_window(df, week_start, week_end)
 
     total_this_week = len(week_df)
 
-    # Create SKU key for unique counting
-    def sku_key(row):
-        return (str(row.get("company_name", "")).upper().strip(),
-                str(row.get("brand_name", "")).upper().strip(),
-                str(row.get("fanciful_name", "")).upper().strip(),
-                str(row.get("class_type_code", "")).upper().strip())
-
-    week_df["sku_key"] = week_df.apply(sku_key, axis=1)
-    unique_skus_this_week = week_df["sku_key"].nunique()
-
-    # Use pre-computed signal column
-    # Normalize signal values (handle None/NaN and variations)
-    week_df["signal_norm"] = week_df["signal"].fillna("").str.upper().str.strip()
+    unique_skus_this_week = week_df["_sku_hash"].nunique()
 
+    # Use pre-computed signal column (normalized in _normalized)
     # Count by signal type
     # NEW_COMPANY and NEW_BRAND both count as "new brands" for the report
-    new_brand_mask = week_df["signal_norm"].isin(["NEW_COMPANY", "NEW_BRAND"])
-    new_sku_mask = week_df["signal_norm"] == "NEW_SKU"
-    refile_mask = week_df["signal_norm"] == "REFILE"
+    # Compare the categorical's int codes rather than the strings (-2 never matches)
+    signals = week_df["_signal_n"].cat
+    codes = signals.codes.to_numpy()
+    code = {label: signals.categories.get_loc(label) if label in signals.categories else -2
+            for label in ("NEW_COMPANY", "NEW_BRAND", "NEW_SKU", "REFILE")}
+    new_brand_mask = (codes == code["NEW_COMPANY"]) | (codes == code["NEW_BRAND"])
+    new_sku_mask = codes == code["NEW_SKU"]
+    refile_mask = codes == code["REFILE"]
 
     # For new brands, count unique (company, brand) combinations
-    new_brand_df = week_df[new_brand_mask].copy()
-    new_brand_df["brand_key"] = new_brand_df.apply(
-        lambda r: (str(r.get("company_name", "")).upper().strip(),
-                   str(r.get("brand_name", "")).upper().strip()),
-        axis=1
-    )
-    new_brands = new_brand_df["brand_key"].nunique()
+    new_brands = week_df.loc[new_brand_mask, "_brand_key"].nunique()
 
     # For new SKUs, count unique SKU keys (includes NEW_COMPANY and NEW_BRAND since they're also new SKUs)
-    new_sku_df = week_df[new_brand_mask | new_sku_mask].copy()
-    new_skus = new_sku_df["sku_key"].nunique()
+    new_skus = week_df.loc[new_brand_mask | new_sku_mask, "_sku_hash"].nunique()
 
     # Refiles = unique SKUs that were seen before
     refiles = unique_skus_this_week - new_skus
     refile_share = (refiles / unique_skus_this_week * 100) if unique_skus_this_week > 0 else 0
 
     # Build teaser lists for new brands
+    teaser_cols = ["brand_name", "fanciful_name", "category", "origin_code", "approval_date", "ttb_id", "signal"]
     new_brand_details = []
     new_brand_rows = []
-    seen_brands = set()
-
-    for _, row in new_brand_df.drop_duplicates(subset=["brand_key"]).head(20).iterrows():
-        brand_name = str(row.get("brand_name", "")).strip()
-        category = row.get("category", "Other")
-        fanciful = str(row.get("fanciful_name", "")).strip()
-        origin = str(row.get("origin_code", "")).strip()
-        approval_date = row.get("approval_date")
-        ttb_id = str(row.get("ttb_id", "")).strip()
-        signal = row.get("signal", "NEW_BRAND")
-
-        brand_key = (str(row.get("company_name", "")).upper(), brand_name.upper())
-        if brand_key not in seen_brands:
-            seen_brands.add(brand_key)
-            if len(new_brand_details) < 10:
-                new_brand_details.append((brand_name, category))
-            if len(new_brand_rows) < 10:
-                new_brand_rows.append({
-                    "brand_name": brand_name,
-                    "fanciful_name": fanciful,
-                    "category": category,
-                    "origin": origin,
-                    "approval_date": approval_date,
-                    "ttb_id": ttb_id,
-                    "signal": signal,
-                })
+
+    brand_teasers = week_df.loc[new_brand_mask].drop_duplicates(subset=["_brand_key"]).head(10)
+    for r in brand_teasers[teaser_cols].itertuples(index=False):
+        brand_name = str(r.brand_name).strip()
+        new_brand_details.append((brand_name, r.category))
+        new_brand_rows.append({
+            "brand_name": brand_name,
+            "fanciful_name": str(r.fanciful_name).strip(),
+            "category": r.category,
+            "origin": str(r.origin_code).strip(),
+            "approval_date": r.approval_date,
+            "ttb_id": str(r.ttb_id).strip(),
+            "signal": r.signal,
+        })
 
     # Build teaser lists for new SKUs (only those with fanciful names, excluding new brands)
     new_sku_details = []
     new_sku_rows = []
 
-    sku_only_df = week_df[new_sku_mask].copy()  # Only NEW_SKU, not NEW_BRAND/NEW_COMPANY
-    for _, row in sku_only_df.drop_duplicates(subset=["sku_key"]).head(20).iterrows():
-        brand_name = str(row.get("brand_name", "")).strip()
-        fanciful = str(row.get("fanciful_name", "")).strip()
-        category = row.get("category", "Other")
-        origin = str(row.get("origin_code", "")).strip()
-        approval_date = row.get("approval_date")
-        ttb_id = str(row.get("ttb_id", "")).strip()
-
-        # Only add to teaser list if it has a real fanciful name
-        if fanciful and fanciful.upper() not in ("NONE", "N/A", ""):
-            sku_display = f"{brand_name} - {fanciful}"
-            if len(new_sku_details) < 10:
-                new_sku_details.append((sku_display, category))
-            if len(new_sku_rows) < 10:
-                new_sku_rows.append({
-                    "brand_name": brand_name,
-                    "fanciful_name": fanciful,
-                    "category": category,
-                    "origin": origin,
-                    "approval_date": approval_date,
-                    "ttb_id": ttb_id,
-                    "signal": "NEW_SKU",
-                })
+    # Only NEW_SKU, not NEW_BRAND/NEW_COMPANY
+    sku_teasers = week_df.loc[new_sku_mask].drop_duplicates(subset=["_sku_hash"]).head(20)
+    # Only list SKUs with a real fanciful name
+    sku_teasers = sku_teasers[~sku_teasers["_fn_n"].isin(["", "NONE", "N/A"])].head(10)
+    for r in sku_teasers[teaser_cols].itertuples(index=False):
+        brand_name = str(r.brand_name).strip()
+        fanciful = str(r.fanciful_name).strip()
+        new_sku_details.append((f"{brand_name} - {fanciful}", r.category))
+        new_sku_rows.append({
+            "brand_name": brand_name,
+            "fanciful_name": fanciful,
+            "category": r.category,
+            "origin": str(r.origin_code).strip(),
+            "approval_date": r.approval_date,
+            "ttb_id": str(r.ttb_id).strip(),
+            "signal": "NEW_SKU",
+        })
 
     return {
         "total_approvals": total_this_week,
@@ -611,43 +844,31 @@ def compute_newness_metrics(df: pd.DataFrame, week_start: datetime, week_end: da
 
 def compute_category_metrics(df: pd.DataFrame, week_start: datetime, week_end: datetime) -> pd.DataFrame:
     """Compute per-category metrics for the headline table."""
-    week_df = df[(df["approval_date"] >= week_start) & (df["approval_date"] <= week_end)]
-    
-    # Total approvals by category this week
-    cat_totals = week_df.groupby("category").size().reset_index(name="total_this_week")
+    df = _normalized(df)
+    week_df = _date_window(df, week_start, week_end)
     
-    # Unique approvals by category (unique SKU keys)
-    def sku_key(row):
-        return (str(row.get("company_name", "")).upper().strip(),
-                str(row.get("brand_name", "")).upper().strip(),
-                str(row.get("fanciful_name", "")).upper().strip(),
-                str(row.get("class_type_code", "")).upper().strip())
-    
-    week_df_copy = week_df.copy()
-    week_df_copy["sku_key"] = week_df_copy.apply(sku_key, axis=1)
-    cat_unique = week_df_copy.groupby("category")["sku_key"].nunique().reset_index(name="unique_this_week")
+    # Total and unique (SKU key) approvals by category this week, in one pass
+    cat_week = week_df.groupby("category", observed=True).agg(
+        total_this_week=("_sku_hash", "size"),
+        unique_this_week=("_sku_hash", "nunique"),
+    )
     
-    # 13-week and 52-week averages
+    # 13-week and 52-week averages (the 13-week window is the tail of the 52-week one)
     weeks_13_ago = week_start - timedelta(weeks=13)
     weeks_52_ago = week_start - timedelta(weeks=52)
     
-    df_13w = df[(df["approval_date"] >= weeks_13_ago) & (df["approval_date"] < week_start)]
-    df_52w = df[(df["approval_date"] >= weeks_52_ago) & (df["approval_date"] < week_start)]
+    df_52w = _date_window(df, weeks_52_ago, week_start, include_end=False)
+    in_13w = df_52w["approval_date"] >= weeks_13_ago
+    cat_hist = in_13w.groupby(df_52w["category"], observed=True).agg(["size", "sum"])
+    cat_hist["avg_13w"] = cat_hist["sum"] / 13
+    cat_hist["avg_52w"] = cat_hist["size"] / 52
     
-    cat_13w = df_13w.groupby("category").size().reset_index(name="count_13w")
-    cat_13w["avg_13w"] = cat_13w["count_13w"] / 13
-    
-    cat_52w = df_52w.groupby("category").size().reset_index(name="count_52w")
-    cat_52w["avg_52w"] = cat_52w["count_52w"] / 52
-    
-    # Merge all
-    result = cat_totals.merge(cat_unique, on="category", how="outer")
-    result = result.merge(cat_13w[["category", "avg_13w"]], on="category", how="outer")
-    result = result.merge(cat_52w[["category", "avg_52w"]], on="category", how="outer")
-    result = result.fillna(0)
+    # Join all
+    result = cat_week.join(cat_hist[["avg_13w", "avg_52w"]], how="outer").reset_index()
+    result = result.fillna({"total_this_week": 0, "unique_this_week": 0, "avg_13w": 0, "avg_52w": 0})
     
     # Sort by category order
-    result["sort_order"] = result["category"].apply(lambda x: CATEGORY_ORDER.index(x) if x in CATEGORY_ORDER else 99)
+    result["sort_order"] = result["category"].map(CATEGORY_INDEX).astype(float).fillna(99).astype(int)
     result = result.sort_values("sort_order").drop(columns=["sort_order"])
     
     return result
@@ -655,6 +876,7 @@ def compute_category_metrics(df: pd.DataFrame, week_start: datetime, week_end: d
 
 def compute_metrics(df: pd.DataFrame) -> Dict:
     """Compute all metrics for the report."""
+    df = _normalized(df)
     today = datetime.now()
     week_start, week_end = last_complete_week(today)
     
@@ -672,30 +894,23 @@ def compute_metrics(df: pd.DataFrame) -> Dict:
     w_unique["ma_13"] = rolling_mean(w_unique["count"], 13)
     w_unique["ma_52"] = rolling_mean(w_unique["count"], 52)
     
-    w_curr = w_unique[w_unique["week"] <= current_week_monday].copy()
+    w_curr = w_unique[w_unique["week"] <= current_week_monday]
     if w_curr.empty:
         raise RuntimeError("No weekly data up to the current report week.")
-    last_row = w_curr.iloc[-1]
     
-    pace_4 = float(last_row["ma_4"]) if not np.isnan(last_row["ma_4"]) else float(w_curr["count"].tail(4).mean())
-    pace_13 = float(last_row["ma_13"]) if not np.isnan(last_row["ma_13"]) else float(w_curr["count"].tail(13).mean())
+    counts = w_curr["count"].to_numpy(dtype=np.float64)
+    ma_4 = float(w_curr["ma_4"].iat[-1])
+    ma_13 = float(w_curr["ma_13"].iat[-1])
+    pace_4 = ma_4 if not np.isnan(ma_4) else float(counts[-4:].mean())
+    pace_13 = ma_13 if not np.isnan(ma_13) else float(counts[-13:].mean())
     
     # YoY on 4-week pace
-    w_curr = w_curr.reset_index(drop=True)
-    tail4 = w_curr["count"].tail(4)
-    last4_avg = float(tail4.mean())
-    
-    if len(w_curr) >= 56:
-        last_year_window = w_curr["count"].iloc[-(52+4):-(52)]
-        last_year_avg = float(last_year_window.mean()) if len(last_year_window) == 4 else np.nan
-    else:
-        last_year_avg = np.nan
+    last4_avg, prior4_avg, last_year_avg = _pace_stats(counts)
     
     yoy_4w = ((last4_avg - last_year_avg) / last_year_avg * 100) if (last_year_avg and not np.isnan(last_year_avg) and last_year_avg > 0) else np.nan
     
     # Direction
-    if len(w_curr) >= 8:
-        prior4_avg = float(w_curr["count"].iloc[-8:-4].mean())
+    if not np.isnan(prior4_avg):
         accel = ((last4_avg - prior4_avg) / prior4_avg * 100) if prior4_avg > 0 else np.nan
     else:
         accel = np.nan
@@ -712,27 +927,16 @@ def compute_metrics(df: pd.DataFrame) -> Dict:
     category_df = compute_category_metrics(df, week_start, week_end)
     
     # Compute unique SKU averages for 4w and 13w (for delta comparison)
-    # We need to compute unique SKUs per week for the past weeks
-    def sku_key(row):
-        return (str(row.get("company_name", "")).upper().strip(),
-                str(row.get("brand_name", "")).upper().strip(),
-                str(row.get("fanciful_name", "")).upper().strip(),
-                str(row.get("class_type_code", "")).upper().strip())
-    
-    # Get unique SKUs per week for past 13 weeks
-    weeks_back_13 = week_start - timedelta(weeks=13)
-    recent_df = df[(df["approval_date"] >= weeks_back_13) & (df["approval_date"] < week_start)].copy()
-    
-    if len(recent_df) > 0:
-        recent_df["sku_key"] = recent_df.apply(sku_key, axis=1)
-        weekly_unique = recent_df.groupby("week")["sku_key"].nunique().reset_index(name="unique_count")
-        
+    # The past 13 weeks' unique counts are already in w_unique
+    weeks_back_13 = current_week_monday - timedelta(weeks=13)
+    past_counts = w_unique.loc[(w_unique["week"] >= weeks_back_13) & (w_unique["week"] < current_week_monday), "count"]
+    
+    if len(past_counts) > 0:
         # 4-week average (last 4 weeks before this week)
-        weeks_4 = weekly_unique.tail(4)
-        unique_4w_avg = weeks_4["unique_count"].mean() if len(weeks_4) > 0 else 0
+        unique_4w_avg = past_counts.tail(4).mean()
         
         # 13-week average
-        unique_13w_avg = weekly_unique["unique_count"].mean() if len(weekly_unique) > 0 else 0
+        unique_13w_avg = past_counts.mean()
     else:
         unique_4w_avg = 0
         unique_13w_avg = 0
@@ -777,9 +981,28 @@ def compute_metrics(df: pd.DataFrame) -> Dict:
 # CHART HELPERS
 # =============================================================================
 
-def _save_fig(fig, out_path: str, dpi: int = 200):
+# matplotlib.pyplot, imported on first chart so --dry-run and metric-only callers skip its import
+_PLT = None
+
+
+def _pyplot():
+    global _PLT
+    if _PLT is None:
+        import matplotlib.pyplot
+        _PLT = matplotlib.pyplot
+    return _PLT
+
+
+def _save_fig(fig, out_path: str, dpi: int = CHART_DPI):
     fig.savefig(out_path, dpi=dpi, bbox_inches="tight", facecolor="white", edgecolor="none")
-    plt.close(fig)
+    _pyplot().close(fig)
+
+
+def _chart_cache_key(name: str, data: pd.DataFrame, *params) -> str:
+    """Content hash of a chart's input frame and parameters, used to name its cached PNG."""
+    h = hashlib.sha1(f"{CHART_CACHE_VERSION}|{name}|{params!r}".encode())
+    h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return h.hexdigest()
 
 
 def add_watermark(ax):
@@ -787,7 +1010,7 @@ def add_watermark(ax):
             fontsize=8, color=COLORS["muted"], alpha=0.7)
 
 
-def chart_market_direction(weekly_df: pd.DataFrame, out_path: str):
+def chart_market_direction(weekly_df: pd.DataFrame, out_path: str, dpi: int = CHART_DPI):
     """
     Single chart showing rolling 4-week, 13-week, and 52-week moving averages of unique SKUs.
     """
@@ -806,7 +1029,9 @@ def chart_market_direction(weekly_df: pd.DataFrame, out_path: str):
     cutoff = df["week"].max() - timedelta(weeks=130)
     df = df[df["week"] >= cutoff]
     
-    fig, ax = plt.subplots(figsize=(8, 2.8))
+    import matplotlib.dates as mdates
+
+    fig, ax = _pyplot().subplots(figsize=(8, 2.8))
     
     ax.plot(df["week"], df["ma_4"], color=COLORS["secondary"], linewidth=2, label="Rolling 4-week average")
     ax.plot(df["week"], df["ma_13"], color=COLORS["primary"], linewidth=2, label="Rolling 13-week average")
@@ -829,18 +1054,20 @@ def chart_market_direction(weekly_df: pd.DataFrame, out_path: str):
     
     add_watermark(ax)
     fig.tight_layout()
-    _save_fig(fig, out_path)
+    _save_fig(fig, out_path, dpi=dpi)
 
 
-def chart_category_trends(df: pd.DataFrame, out_path: str):
+def chart_category_trends(df: pd.DataFrame, out_path: str, dpi: int = WEB_CHART_DPI):
     """Small multiples showing each category's weekly approvals + 13-week MA."""
     categories = ['Whiskey', 'Wine', 'Beer', 'Tequila', 'Vodka', 'RTD', 'Rum', 'Gin']
     
     # Last 2 years
     cutoff = df["week"].max() - timedelta(weeks=104)
-    df_filtered = df[df["approval_date"] >= cutoff].copy()
+    df_filtered = df[df["approval_date"] >= cutoff]
     
-    fig, axes = plt.subplots(4, 2, figsize=(8, 6.5))
+    import matplotlib.dates as mdates
+
+    fig, axes = _pyplot().subplots(4, 2, figsize=(8, 6.5))
     axes = axes.flatten()
     
     for idx, cat in enumerate(categories):
@@ -850,7 +1077,8 @@ def chart_category_trends(df: pd.DataFrame, out_path: str):
         weekly = weekly.sort_values("week")
         weekly["ma_13"] = rolling_mean(weekly["count"], 13)
         
-        ax.bar(weekly["week"], weekly["count"], color=COLORS["bar"], alpha=0.7, width=5)
+        # One stepped fill instead of a Rectangle patch per weekly bar
+        ax.fill_between(weekly["week"], 0, weekly["count"], step="mid", color=COLORS["bar"], alpha=0.7, linewidth=0)
         ax.plot(weekly["week"], weekly["ma_13"], color=COLORS["line"], linewidth=1.5)
         
         ax.set_title(cat, fontsize=10, fontweight="bold", color=COLORS["primary"])
@@ -865,42 +1093,37 @@ def chart_category_trends(df: pd.DataFrame, out_path: str):
     fig.suptitle("Category Trends (Last 2 Years): bars = weekly, line = 13-week avg",
                  fontsize=10, y=0.995)
     fig.tight_layout()
-    _save_fig(fig, out_path)
+    _save_fig(fig, out_path, dpi=dpi)
 
 
-def chart_competitive_activity(df: pd.DataFrame, week_start: datetime, week_end: datetime, out_path: str):
+def chart_competitive_activity(df: pd.DataFrame, week_start: datetime, week_end: datetime, out_path: str, dpi: int = CHART_DPI):
     """Horizontal bar chart of top brands by unique SKUs this week."""
-    week_df = df[(df["approval_date"] >= week_start) & (df["approval_date"] <= week_end)].copy()
-    
-    # Helper for normalization
-    def norm(s):
-        return str(s or "").upper().strip()
-    
-    # Create proper keys - brand_id for grouping, sku_key for unique counting
-    week_df["brand_id"] = week_df.apply(
-        lambda r: (norm(r["company_name"]), norm(r["brand_name"])), axis=1
-    )
-    week_df["sku_key"] = week_df.apply(
-        lambda r: (norm(r["company_name"]), norm(r["brand_name"]),
-                   norm(r["fanciful_name"]), norm(r["class_type_code"])), axis=1
-    )
+    df = _normalized(df)
+    week_df = _date_window(df, week_start, week_end)
+    
+    # Count unique SKUs per brand_id (on a small key frame, not a copy of the week)
+    keys = pd.DataFrame({
+        "brand_id": week_df["_brand_key"],
+        "sku_key": week_df["_sku_hash"],
+        "brand": week_df["brand_name"].fillna(""),
+        "company": week_df["company_name"].fillna(""),
+    })
+    brand_counts = keys.groupby("brand_id").agg(
+        count=("sku_key", "nunique"),
+        brand=("brand", "first"),  # Get one label per brand_id
+        company=("company", "first"),
+    ).reset_index()
+    brand_counts = brand_counts.sort_values("count", ascending=False).head(12)
     
-    # Create display label: BRAND (COMPANY)
-    week_df["brand_label"] = week_df.apply(
-        lambda r: f"{r['brand_name']} ({r['company_name'][:25]}{'...' if len(str(r['company_name'])) > 25 else ''})", 
-        axis=1
+    # Create display label: BRAND (COMPANY), only for the brands shown
+    company = brand_counts["company"]
+    brand_counts["label"] = (
+        brand_counts["brand"] + " (" + company.str.slice(0, 25) +
+        np.where(company.str.len() > 25, "...", "") + ")"
     )
-    
-    # Count unique SKUs per brand_id
-    brand_counts = week_df.groupby("brand_id").agg({
-        "sku_key": "nunique",
-        "brand_label": "first"  # Get one label per brand_id
-    }).reset_index()
-    brand_counts.columns = ["brand_id", "count", "label"]
-    brand_counts = brand_counts.sort_values("count", ascending=False).head(12)
     brand_counts = brand_counts.sort_values("count", ascending=True)  # Reverse for horizontal bar
     
-    fig, ax = plt.subplots(figsize=(8, 4.5))
+    fig, ax = _pyplot().subplots(figsize=(8, 4.5))
     
     y_pos = range(len(brand_counts))
     bars = ax.barh(y_pos, brand_counts["count"], color=COLORS["primary"], alpha=0.85)
@@ -921,36 +1144,24 @@ def chart_competitive_activity(df: pd.DataFrame, week_start: datetime, week_end:
     ax.set_xlim(0, brand_counts["count"].max() * 1.25)
     add_watermark(ax)
     fig.tight_layout()
-    _save_fig(fig, out_path)
+    _save_fig(fig, out_path, dpi=dpi)
 
 
-def chart_origin_mix(df: pd.DataFrame, week_start: datetime, week_end: datetime, out_path: str):
+def chart_origin_mix(df: pd.DataFrame, week_start: datetime, week_end: datetime, out_path: str, dpi: int = WEB_CHART_DPI):
     """Pie chart of domestic/import + bar chart of top origins."""
-    week_df = df[(df["approval_date"] >= week_start) & (df["approval_date"] <= week_end)]
+    df = _normalized(df)
+    week_df = _date_window(df, week_start, week_end)
     
     # Classify as domestic (US states) vs import (countries)
-    us_states = {'ALABAMA', 'ALASKA', 'ARIZONA', 'ARKANSAS', 'CALIFORNIA', 'COLORADO', 'CONNECTICUT',
-                 'DELAWARE', 'FLORIDA', 'GEORGIA', 'HAWAII', 'IDAHO', 'ILLINOIS', 'INDIANA', 'IOWA',
-                 'KANSAS', 'KENTUCKY', 'LOUISIANA', 'MAINE', 'MARYLAND', 'MASSACHUSETTS', 'MICHIGAN',
-                 'MINNESOTA', 'MISSISSIPPI', 'MISSOURI', 'MONTANA', 'NEBRASKA', 'NEVADA', 'NEW HAMPSHIRE',
-                 'NEW JERSEY', 'NEW MEXICO', 'NEW YORK', 'NORTH CAROLINA', 'NORTH DAKOTA', 'OHIO',
-                 'OKLAHOMA', 'OREGON', 'PENNSYLVANIA', 'RHODE ISLAND', 'SOUTH CAROLINA', 'SOUTH DAKOTA',
-                 'TENNESSEE', 'TEXAS', 'UTAH', 'VERMONT', 'VIRGINIA', 'WASHINGTON', 'WEST VIRGINIA',
-                 'WISCONSIN', 'WYOMING', 'DISTRICT OF COLUMBIA', 'PUERTO RICO', 'VIRGIN ISLANDS'}
-    
-    week_df = week_df.copy()
-    week_df["origin_upper"] = week_df["origin_code"].fillna("").str.upper().str.strip()
-    week_df["is_domestic"] = week_df["origin_upper"].isin(us_states)
-    
-    domestic_count = week_df["is_domestic"].sum()
+    domestic_count = week_df["_orig_n"].isin(US_STATES).sum()
     import_count = len(week_df) - domestic_count
     total = len(week_df)
     
     # Top origins
-    origin_counts = week_df.groupby("origin_code").size().reset_index(name="count")
+    origin_counts = week_df.groupby("origin_code", observed=True).size().reset_index(name="count")
     origin_counts = origin_counts.sort_values("count", ascending=False).head(10)
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(8, 4), gridspec_kw={'width_ratios': [1, 1.3]})
+    fig, (ax1, ax2) = _pyplot().subplots(1, 2, figsize=(8, 4), gridspec_kw={'width_ratios': [1, 1.3]})
     
     # Pie chart - force perfect circle
     if total > 0:
@@ -983,143 +1194,294 @@ def chart_origin_mix(df: pd.DataFrame, week_start: datetime, week_end: datetime,
     
     add_watermark(ax2)
     fig.tight_layout()
-    _save_fig(fig, out_path)
+    _save_fig(fig, out_path, dpi=dpi)
 
 
 # =============================================================================
 # PDF BUILD
 # =============================================================================
 
+# Header/footer geometry (points)
+_LOGO_MAX_W = 1.0*inch
+_LOGO_MAX_H = 0.5*inch
+_LOGO_Y_OFFSET = 0.12*inch
+_LINE_Y_OFFSET = 0.02*inch
+_FOOTER_Y = 0.4*inch
+
+# (ImageReader, (width, height)) for the header logo, loaded on first use;
+# False once we know there is no logo file
+_LOGO = None
+
+
+def _logo():
+    global _LOGO
+    if _LOGO is None:
+        if os.path.exists(LOGO_PATH):
+            reader = ImageReader(LOGO_PATH)
+            _LOGO = (reader, reader.getSize())
+        else:
+            _LOGO = False
+    return _LOGO or None
+
+
 def _logo_dims(max_w: float, max_h: float):
-    if not os.path.exists(LOGO_PATH):
+    logo = _logo()
+    if not logo:
         return None
-    img = ImageReader(LOGO_PATH)
-    iw, ih = img.getSize()
+    iw, ih = logo[1]
     scale = min(max_w / iw, max_h / ih)
     return (iw * scale, ih * scale)
 
 
 def draw_header_footer(canvas, doc):
-    # Logo
-    if os.path.exists(LOGO_PATH):
-        dims = _logo_dims(max_w=1.0*inch, max_h=0.5*inch)
-        if dims:
-            w, h = dims
-            x = doc.pagesize[0] - doc.rightMargin - w
-            y = doc.pagesize[1] - doc.topMargin + 0.12*inch
-            canvas.drawImage(LOGO_PATH, x, y, width=w, height=h, mask="auto")
+    page_w, page_h = doc.pagesize
+    right_x = page_w - doc.rightMargin
+    top_y = page_h - doc.topMargin
+
+    # Logo (decoded once and reused on every page)
+    dims = _logo_dims(max_w=_LOGO_MAX_W, max_h=_LOGO_MAX_H)
+    if dims:
+        w, h = dims
+        canvas.drawImage(_LOGO[0], right_x - w, top_y + _LOGO_Y_OFFSET, width=w, height=h, mask="auto")
     
     # Header divider line
-    canvas.setStrokeColor(HexColor(COLORS["grid"]))
+    canvas.setStrokeColor(PDF_COLORS["grid"])
     canvas.setLineWidth(0.5)
-    line_y = doc.pagesize[1] - doc.topMargin + 0.02*inch
-    canvas.line(doc.leftMargin, line_y, doc.pagesize[0] - doc.rightMargin, line_y)
+    line_y = top_y + _LINE_Y_OFFSET
+    canvas.line(doc.leftMargin, line_y, right_x, line_y)
     
     # Footer: database link on left, page number on right
     canvas.setFont("Helvetica", 8)
-    canvas.setFillColor(HexColor(COLORS["primary"]))
-    canvas.drawString(doc.leftMargin, 0.4*inch, "bevalcintel.com/database")
-    
-    canvas.setFillColor(HexColor(COLORS["muted"]))
-    canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 0.4*inch, f"Page {doc.page}")
+    canvas.setFillColor(PDF_COLORS["primary"])
+    canvas.drawString(doc.leftMargin, _FOOTER_Y, "bevalcintel.com/database")
+    
+    canvas.setFillColor(PDF_COLORS["muted"])
+    canvas.drawRightString(right_x, _FOOTER_Y, f"Page {doc.page}")
+
+
+# BI_* paragraph styles as (name, parent style, overrides), added by make_styles()
+_BI_STYLE_SPECS = (
+    ("BI_Title", "Heading1", {"fontSize": 22, "alignment": TA_CENTER, "textColor": PDF_COLORS["secondary"], "spaceAfter": 4}),
+    ("BI_Subtitle", "Normal", {"fontSize": 10, "alignment": TA_CENTER, "textColor": PDF_COLORS["muted"], "spaceAfter": 8}),
+    ("BI_Body", "Normal", {"fontSize": 10, "leading": 13, "textColor": PDF_COLORS["text"], "spaceAfter": 6}),
+    ("BI_Section", "Heading2", {"fontSize": 13, "textColor": PDF_COLORS["primary"], "spaceBefore": 10, "spaceAfter": 4}),
+    ("BI_Small", "Normal", {"fontSize": 9, "leading": 11, "textColor": PDF_COLORS["muted"], "spaceAfter": 3}),
+    ("BI_TableCell", "Normal", {"fontSize": 9, "leading": 11, "textColor": PDF_COLORS["text"]}),
+    ("BI_TableHeader", "Normal", {"fontSize": 8.5, "leading": 10, "textColor": white, "fontName": "Helvetica-Bold"}),
+    ("BI_TableCellRight", "Normal", {"fontSize": 9, "leading": 11, "textColor": PDF_COLORS["text"], "alignment": 2}),  # alignment=2: RIGHT
+    ("BI_Footnote", "Normal", {"fontSize": 8, "leading": 10, "textColor": PDF_COLORS["muted"], "spaceAfter": 4}),
+    # Scoreboard styles
+    ("BI_ScoreLabel", "Normal", {"fontSize": 9, "leading": 11, "textColor": PDF_COLORS["muted"], "alignment": TA_CENTER}),
+    ("BI_ScoreValue", "Normal", {"fontSize": 18, "leading": 20, "textColor": PDF_COLORS["secondary"], "alignment": TA_CENTER, "fontName": "Helvetica-Bold"}),
+    # CTA box styles
+    ("BI_CTATitle", "Heading2", {"fontSize": 11, "textColor": PDF_COLORS["secondary"], "spaceBefore": 0, "spaceAfter": 4, "fontName": "Helvetica-Bold"}),
+    ("BI_CTABody", "Normal", {"fontSize": 9, "leading": 12, "textColor": PDF_COLORS["text"], "spaceAfter": 2}),
+    ("BI_CTABold", "Normal", {"fontSize": 9, "leading": 12, "textColor": PDF_COLORS["text"], "spaceAfter": 2, "fontName": "Helvetica-Bold"}),
+    ("BI_Button", "BI_CTABody", {"textColor": white, "alignment": TA_CENTER}),
+    ("BI_Locked", "Normal", {"fontSize": 8, "leading": 10, "textColor": PDF_COLORS["muted"], "alignment": TA_CENTER}),
+    ("BI_PlayTitle", "Normal", {"fontSize": 10, "leading": 12, "textColor": PDF_COLORS["primary"], "spaceAfter": 2, "fontName": "Helvetica-Bold"}),
+    ("BI_PlayBody", "Normal", {"fontSize": 9, "leading": 11, "textColor": PDF_COLORS["text"], "spaceAfter": 6}),
+)
+
+# Built once per process by make_styles(); build_pdf only reads from it
+_STYLES = None
 
 
 def make_styles():
-    styles = getSampleStyleSheet()
+    """Return the report stylesheet (sample sheet + BI_* styles), built on first use."""
+    global _STYLES
+    if _STYLES is not None:
+        return _STYLES
 
-    styles.add(ParagraphStyle(
-        name="BI_Title", parent=styles["Heading1"], fontSize=22,
-        alignment=TA_CENTER, textColor=HexColor(COLORS["secondary"]), spaceAfter=4,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_Subtitle", parent=styles["Normal"], fontSize=10,
-        alignment=TA_CENTER, textColor=HexColor(COLORS["muted"]), spaceAfter=8,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_Body", parent=styles["Normal"], fontSize=10,
-        leading=13, textColor=HexColor(COLORS["text"]), spaceAfter=6,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_Section", parent=styles["Heading2"], fontSize=13,
-        textColor=HexColor(COLORS["primary"]), spaceBefore=10, spaceAfter=4,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_Small", parent=styles["Normal"], fontSize=9,
-        leading=11, textColor=HexColor(COLORS["muted"]), spaceAfter=3,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_TableCell", parent=styles["Normal"], fontSize=9,
-        leading=11, textColor=HexColor(COLORS["text"]),
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_TableHeader", parent=styles["Normal"], fontSize=8.5,
-        leading=10, textColor=white, fontName="Helvetica-Bold",
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_TableCellRight", parent=styles["Normal"], fontSize=9,
-        leading=11, textColor=HexColor(COLORS["text"]), alignment=2,  # RIGHT
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_Footnote", parent=styles["Normal"], fontSize=8,
-        leading=10, textColor=HexColor(COLORS["muted"]), spaceAfter=4,
-    ))
-    # Scoreboard styles
-    styles.add(ParagraphStyle(
-        name="BI_ScoreLabel", parent=styles["Normal"], fontSize=9,
-        leading=11, textColor=HexColor(COLORS["muted"]), alignment=TA_CENTER,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_ScoreValue", parent=styles["Normal"], fontSize=18,
-        leading=20, textColor=HexColor(COLORS["secondary"]), alignment=TA_CENTER,
-        fontName="Helvetica-Bold",
-    ))
-    # CTA box styles
-    styles.add(ParagraphStyle(
-        name="BI_CTATitle", parent=styles["Heading2"], fontSize=11,
-        textColor=HexColor(COLORS["secondary"]), spaceBefore=0, spaceAfter=4,
-        fontName="Helvetica-Bold",
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_CTABody", parent=styles["Normal"], fontSize=9,
-        leading=12, textColor=HexColor(COLORS["text"]), spaceAfter=2,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_CTABold", parent=styles["Normal"], fontSize=9,
-        leading=12, textColor=HexColor(COLORS["text"]), spaceAfter=2,
-        fontName="Helvetica-Bold",
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_Locked", parent=styles["Normal"], fontSize=8,
-        leading=10, textColor=HexColor(COLORS["muted"]), alignment=TA_CENTER,
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_PlayTitle", parent=styles["Normal"], fontSize=10,
-        leading=12, textColor=HexColor(COLORS["primary"]), spaceAfter=2,
-        fontName="Helvetica-Bold",
-    ))
-    styles.add(ParagraphStyle(
-        name="BI_PlayBody", parent=styles["Normal"], fontSize=9,
-        leading=11, textColor=HexColor(COLORS["text"]), spaceAfter=6,
-    ))
+    styles = getSampleStyleSheet()
+    for name, parent, kwargs in _BI_STYLE_SPECS:
+        styles.add(ParagraphStyle(name=name, parent=styles[parent], **kwargs))
+    _STYLES = styles
     return styles
 
 
+# Scoreboard cell markup; colors are fixed, so only the value/subtext is filled in per cell
+_SCORE_VALUE_HTML = f"<font size='20' color='{COLORS['secondary']}'><b>{{}}</b></font>"
+_SCORE_SUBTEXT_HTML = f"<font size='8' color='{COLORS['muted']}'>{{}}</font>"
+# CTA "Start here" line for one brand name
+_SEARCH_LINK_HTML = f"• In search, type: <b><a href='https://bevalcintel.com/database' color='{COLORS['primary']}'>{{}}</a></b>"
+
+# Table styles are built once at import and shared by every build_pdf() call;
+# command lists are tuples over the prebuilt PDF_COLORS.
+# Header band, grid and zebra rows shared by the data tables
+_GRID_TABLE_CMDS = (
+    ("BACKGROUND", (0, 0), (-1, 0), PDF_COLORS["secondary"]),
+    ("TEXTCOLOR", (0, 0), (-1, 0), white),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("GRID", (0, 0), (-1, -1), 0.25, PDF_COLORS["grid"]),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), ROW_STRIPES),
+)
+
+# Page 1 scoreboard rows (the second row also gets a divider underneath)
+_SCORE_ROW_STYLE = TableStyle((
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+))
+_SCORE_ROW_WITH_LINE_STYLE = TableStyle((
+    ("LINEBELOW", (0, 0), (-1, -1), 0.5, PDF_COLORS["grid"]),
+), parent=_SCORE_ROW_STYLE)
+
+# Page 1 "Top 5" teaser tables
+_TEASER_TABLE_STYLE = TableStyle(_GRID_TABLE_CMDS + (
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("LEFTPADDING", (0, 0), (-1, -1), 8),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+    ("TOPPADDING", (0, 0), (-1, -1), 5),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+))
+
+# "Open the database" button and the CTA box around it
+_BUTTON_STYLE = TableStyle((
+    ("BACKGROUND", (0, 0), (-1, -1), PDF_COLORS["primary"]),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("TOPPADDING", (0, 0), (-1, -1), 6),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ("LEFTPADDING", (0, 0), (-1, -1), 12),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+))
+_CTA_BOX_STYLE = TableStyle((
+    ("BACKGROUND", (0, 0), (-1, -1), CTA_BG),
+    ("BOX", (0, 0), (-1, -1), 1.5, PDF_COLORS["primary"]),
+    ("LEFTPADDING", (0, 0), (-1, -1), 14),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 14),
+    ("TOPPADDING", (0, 0), (-1, -1), 10),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+))
+
+# Page 2 category table and Pro example table
+_CATEGORY_TABLE_STYLE = TableStyle(_GRID_TABLE_CMDS + (
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("ALIGN", (0, 0), (0, -1), "LEFT"),
+    ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+    ("ALIGN", (2, 0), (2, -1), "LEFT"),
+    ("ALIGN", (3, 0), (3, -1), "RIGHT"),
+    ("LEFTPADDING", (0, 0), (-1, -1), 6),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+    ("TOPPADDING", (0, 0), (-1, -1), 3),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+    # Add vertical line between left and right sections (data rows only, not header)
+    ("LINEAFTER", (1, 1), (1, -1), 0.75, PDF_COLORS["secondary"]),
+))
+_PRO_TEASER_TABLE_STYLE = TableStyle(_GRID_TABLE_CMDS + (
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+    ("ALIGN", (0, 1), (1, -1), "LEFT"),
+    ("ALIGN", (2, 1), (-1, -1), "CENTER"),
+    ("LEFTPADDING", (0, 0), (-1, -1), 4),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+    ("TOPPADDING", (0, 0), (-1, -1), 3),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+))
+
+# Single-cell wrapper used to center a table on the page
+_CENTER_WRAPPER_STYLE = TableStyle((
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+))
+
+# Final upgrade box on page 3
+_UPGRADE_BOX_STYLE = TableStyle((
+    ("BACKGROUND", (0, 0), (-1, -1), UPGRADE_BG),
+    ("BOX", (0, 0), (-1, -1), 1, PDF_COLORS["primary"]),
+    ("LEFTPADDING", (0, 0), (-1, -1), 10),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 10),
+    ("TOPPADDING", (0, 0), (-1, -1), 8),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+))
+
+
+# "—" placeholder cell, shared by every empty table cell. Tables re-wrap a cell's
+# flowable right before drawing it, so one Paragraph can sit in cells of any width.
+_DASH_CELL = None
+
+
+def _dash() -> Paragraph:
+    global _DASH_CELL
+    if _DASH_CELL is None:
+        _DASH_CELL = Paragraph("—", make_styles()["BI_TableCell"])
+    return _DASH_CELL
+
+
+def _trunc(text: str, n: int) -> str:
+    """Cut text to n characters with a trailing ellipsis when it is longer."""
+    return text if len(text) <= n else text[:n] + "..."
+
+
+def _build_teaser_table(header: str, items, truncate_to: Optional[int] = None) -> Table:
+    """Single-column Top 5 table: name with category as muted subtext, padded to 5 rows."""
+    styles = make_styles()
+    data = [[Paragraph(header, styles["BI_TableHeader"])]]
+    for item in items[:5]:
+        if isinstance(item, tuple):
+            name, category = item
+        else:
+            name, category = item, ""
+        if truncate_to:
+            name = _trunc(name, truncate_to)
+        cell_text = f"{name}<br/><font size='7' color='{COLORS['muted']}'>{category}</font>" if category else name
+        data.append([Paragraph(cell_text, styles["BI_TableCell"])])
+    # Pad to 6 rows if needed
+    while len(data) < 6:
+        data.append([_dash()])
+    return Table(data, colWidths=[3.3*inch], rowHeights=[22] + [32]*5, style=_TEASER_TABLE_STYLE)
+
+
 def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
-    os.makedirs(os.path.dirname(out_pdf), exist_ok=True)
+    _ensure_dir(os.path.dirname(out_pdf))
     styles = make_styles()
 
     assets_dir = os.path.join(os.path.dirname(out_pdf), "_assets")
-    os.makedirs(assets_dir, exist_ok=True)
+    _ensure_dir(assets_dir)
 
     def asset(name: str) -> str:
         return os.path.join(assets_dir, name)
 
-    doc = SimpleDocTemplate(
-        out_pdf, pagesize=letter,
-        leftMargin=0.65*inch, rightMargin=0.65*inch,
-        topMargin=0.75*inch, bottomMargin=0.65*inch,
-        title="BevAlc Intelligence — Weekly Snapshot"
-    )
+    # Render the charts up front, one worker process each when there are spare cores.
+    # The competitive chart only needs the report week, so only that slice is sent.
+    # Rendered PNGs are kept in _assets/cache keyed on their inputs, so rebuilding the
+    # same week's report copies them instead of re-rendering. Entries this run did not
+    # use are deleted, so the cache only ever holds the current charts.
+    md_path = asset("market_direction.png")
+    comp_path = asset("competitive_activity.png")
+    df = _normalized(df)
+    week_df = _date_window(df, metrics["week_start"], metrics["week_end"])
+    chart_cache_dir = asset("cache")
+    _ensure_dir(chart_cache_dir)
+    charts = [
+        (chart_market_direction, (metrics["weekly_df"], md_path), md_path,
+         _chart_cache_key("market_direction", metrics["weekly_df"], CHART_DPI)),
+        (chart_competitive_activity, (week_df, metrics["week_start"], metrics["week_end"], comp_path), comp_path,
+         _chart_cache_key("competitive_activity", week_df[["_sku_hash", "brand_name", "company_name"]],
+                          metrics["week_start"], metrics["week_end"], CHART_DPI)),
+    ]
+    chart_jobs = []
+    for fn, args, out_path, key in charts:
+        cached = os.path.join(chart_cache_dir, f"{key}.png")
+        if os.path.exists(cached):
+            shutil.copyfile(cached, out_path)
+        else:
+            chart_jobs.append((fn, args, out_path, cached))
+    if len(chart_jobs) > 1 and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=len(chart_jobs)) as chart_pool:
+            for job in [chart_pool.submit(fn, *args) for fn, args, _, _ in chart_jobs]:
+                job.result()
+    else:
+        for fn, args, _, _ in chart_jobs:
+            fn(*args)
+    for _, _, out_path, cached in chart_jobs:
+        shutil.copyfile(out_path, cached)
+    used = {f"{key}.png" for _, _, _, key in charts}
+    for name in os.listdir(chart_cache_dir):
+        if name not in used:
+            os.remove(os.path.join(chart_cache_dir, name))
 
     story = []
 
@@ -1145,11 +1507,11 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     # ==========================================================================
     def score_cell(label, value, subtext=None):
         content = [
-            Paragraph(f"<font size='20' color='{COLORS['secondary']}'><b>{value}</b></font>", styles["BI_ScoreValue"]),
+            Paragraph(_SCORE_VALUE_HTML.format(value), styles["BI_ScoreValue"]),
             Paragraph(label, styles["BI_ScoreLabel"]),
         ]
         if subtext:
-            content.append(Paragraph(f"<font size='8' color='{COLORS['muted']}'>{subtext}</font>", styles["BI_ScoreLabel"]))
+            content.append(Paragraph(_SCORE_SUBTEXT_HTML.format(subtext), styles["BI_ScoreLabel"]))
         return content
     
     # Format delta (only 13W now)
@@ -1159,36 +1521,31 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     # Refile share
     refile_share = (metrics['refiles'] / metrics['unique_approvals'] * 100) if metrics['unique_approvals'] > 0 else 0
     
+    # Scoreboard numbers, formatted once
+    score_values = {
+        key: f"{metrics[key]:,}"
+        for key in ("total_approvals", "unique_approvals", "new_brands", "new_skus", "refiles")
+    }
+    
     # Row 1: Total Approvals | Unique SKUs (with delta) | Refile Share (with subtext)
     row1_data = [[
-        score_cell("Total Approvals", f"{metrics['total_approvals']:,}"),
-        score_cell("Unique SKUs", f"{metrics['unique_approvals']:,}", delta_text),
+        score_cell("Total Approvals", score_values["total_approvals"]),
+        score_cell("Unique SKUs", score_values["unique_approvals"], delta_text),
         score_cell("Refile Share", f"{refile_share:.1f}%", "of unique SKUs"),
     ]]
     
     # Row 2: New Brands (with subtext) | New SKUs | Refiles
     row2_data = [[
-        score_cell("New Brands (first-seen)", f"{metrics['new_brands']:,}", "not seen in prior history"),
-        score_cell("New SKUs", f"{metrics['new_skus']:,}"),
-        score_cell("Refiles", f"{metrics['refiles']:,}"),
+        score_cell("New Brands (first-seen)", score_values["new_brands"], "not seen in prior history"),
+        score_cell("New SKUs", score_values["new_skus"]),
+        score_cell("Refiles", score_values["refiles"]),
     ]]
     
     row1_tbl = Table(row1_data, colWidths=[2.2*inch]*3)
-    row1_tbl.setStyle(TableStyle([
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("TOPPADDING", (0, 0), (-1, -1), 4),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-    ]))
+    row1_tbl.setStyle(_SCORE_ROW_STYLE)
     
     row2_tbl = Table(row2_data, colWidths=[2.2*inch]*3)
-    row2_tbl.setStyle(TableStyle([
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("TOPPADDING", (0, 0), (-1, -1), 4),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ("LINEBELOW", (0, 0), (-1, -1), 0.5, HexColor(COLORS["grid"])),
-    ]))
+    row2_tbl.setStyle(_SCORE_ROW_WITH_LINE_STYLE)
     
     story.append(row1_tbl)
     story.append(row2_tbl)
@@ -1204,71 +1561,13 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     # ==========================================================================
     story.append(Paragraph("New This Week (Preview)", styles["BI_Section"]))
     
-    def p(txt): return Paragraph(txt, styles["BI_TableCell"])
+    def p(txt): return _dash() if txt == "—" else Paragraph(txt, styles["BI_TableCell"])
     def ph(txt): return Paragraph(txt, styles["BI_TableHeader"])
     def pr(txt): return Paragraph(txt, styles["BI_TableCellRight"])
     
-    # Top New Brands table - single column with category as subtext
-    brands_data = [[ph("Top 5 New Brands")]]
     brand_items = metrics.get("top_new_brands", [])[:5]
-    for item in brand_items:
-        if isinstance(item, tuple):
-            brand_name, category = item
-        else:
-            brand_name, category = item, ""
-        cell_text = f"{brand_name}<br/><font size='7' color='{COLORS['muted']}'>{category}</font>" if category else brand_name
-        brands_data.append([Paragraph(cell_text, styles["BI_TableCell"])])
-    # Pad to 6 rows if needed
-    while len(brands_data) < 6:
-        brands_data.append([p("—")])
-    
-    brands_tbl = Table(brands_data, colWidths=[3.3*inch], rowHeights=[22] + [32]*5)
-    brands_tbl.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), HexColor(COLORS["secondary"])),
-        ("TEXTCOLOR", (0, 0), (-1, 0), white),
-        ("FONTSIZE", (0, 0), (-1, 0), 9),
-        ("FONTSIZE", (0, 1), (-1, -1), 9),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("GRID", (0, 0), (-1, -1), 0.25, HexColor(COLORS["grid"])),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#ffffff"), HexColor("#f9fafb")]),
-        ("LEFTPADDING", (0, 0), (-1, -1), 8),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-        ("TOPPADDING", (0, 0), (-1, -1), 5),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-    ]))
-    
-    # Top New SKUs table - single column with category as subtext
-    skus_data = [[ph("Top 5 New SKUs")]]
-    sku_items = metrics.get("top_new_skus", [])[:5]
-    for item in sku_items:
-        if isinstance(item, tuple):
-            sku_name, category = item
-        else:
-            sku_name, category = item, ""
-        # Truncate if too long
-        display_sku = sku_name[:45] + "..." if len(sku_name) > 45 else sku_name
-        cell_text = f"{display_sku}<br/><font size='7' color='{COLORS['muted']}'>{category}</font>" if category else display_sku
-        skus_data.append([Paragraph(cell_text, styles["BI_TableCell"])])
-    # Pad to 6 rows if needed
-    while len(skus_data) < 6:
-        skus_data.append([p("—")])
-    
-    skus_tbl = Table(skus_data, colWidths=[3.3*inch], rowHeights=[22] + [32]*5)
-    skus_tbl.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), HexColor(COLORS["secondary"])),
-        ("TEXTCOLOR", (0, 0), (-1, 0), white),
-        ("FONTSIZE", (0, 0), (-1, 0), 9),
-        ("FONTSIZE", (0, 1), (-1, -1), 9),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("GRID", (0, 0), (-1, -1), 0.25, HexColor(COLORS["grid"])),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#ffffff"), HexColor("#f9fafb")]),
-        ("LEFTPADDING", (0, 0), (-1, -1), 8),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-        ("TOPPADDING", (0, 0), (-1, -1), 5),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-    ]))
+    brands_tbl = _build_teaser_table("Top 5 New Brands", brand_items)
+    skus_tbl = _build_teaser_table("Top 5 New SKUs", metrics.get("top_new_skus", []), truncate_to=45)
     
     # Side by side
     teaser_row = Table([[brands_tbl, Spacer(0.15*inch, 0), skus_tbl]])
@@ -1278,16 +1577,9 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     # ==========================================================================
     # "DO THIS NEXT (60 seconds)" CTA BOX
     # ==========================================================================
-    # Get first 3 brands for dynamic inserts
-    first_brand = ""
-    second_brand = ""
-    third_brand = ""
-    if brand_items:
-        first_brand = brand_items[0][0] if isinstance(brand_items[0], tuple) else brand_items[0]
-        if len(brand_items) > 1:
-            second_brand = brand_items[1][0] if isinstance(brand_items[1], tuple) else brand_items[1]
-        if len(brand_items) > 2:
-            third_brand = brand_items[2][0] if isinstance(brand_items[2], tuple) else brand_items[2]
+    # Get first 3 brands for dynamic inserts ("" when there are fewer)
+    brand_picks = [b[0] if isinstance(b, tuple) else b for b in brand_items[:3]]
+    brand_picks += [""] * (3 - len(brand_picks))
     
     cta_content = []
     cta_content.append(Paragraph("<b>Do this next (takes 60 seconds)</b>", styles["BI_CTATitle"]))
@@ -1299,40 +1591,20 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     ))
     cta_content.append(Spacer(1, 4))
     cta_content.append(Paragraph("<b>Start here:</b>", styles["BI_CTABody"]))
-    if first_brand:
-        cta_content.append(Paragraph(
-            f"• In search, type: <b><a href='https://bevalcintel.com/database' color='{COLORS['primary']}'>{first_brand}</a></b>",
-            styles["BI_CTABody"]
-        ))
-    if second_brand:
-        cta_content.append(Paragraph(
-            f"• In search, type: <b><a href='https://bevalcintel.com/database' color='{COLORS['primary']}'>{second_brand}</a></b>",
-            styles["BI_CTABody"]
-        ))
-    if third_brand:
-        cta_content.append(Paragraph(
-            f"• In search, type: <b><a href='https://bevalcintel.com/database' color='{COLORS['primary']}'>{third_brand}</a></b>",
-            styles["BI_CTABody"]
-        ))
+    for brand in brand_picks:
+        if brand:
+            cta_content.append(Paragraph(_SEARCH_LINK_HTML.format(brand), styles["BI_CTABody"]))
     cta_content.append(Spacer(1, 6))
     
     # Button-style link
     button_tbl = Table(
         [[Paragraph(
             f"<b><a href='https://bevalcintel.com/database' color='white'>Open the database →</a></b>",
-            ParagraphStyle("btn", parent=styles["BI_CTABody"], textColor=white, alignment=TA_CENTER)
+            styles["BI_Button"]
         )]],
         colWidths=[2.2*inch]
     )
-    button_tbl.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, -1), HexColor(COLORS["primary"])),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("TOPPADDING", (0, 0), (-1, -1), 6),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-        ("LEFTPADDING", (0, 0), (-1, -1), 12),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-    ]))
+    button_tbl.setStyle(_BUTTON_STYLE)
     cta_content.append(button_tbl)
     cta_content.append(Spacer(1, 4))
     cta_content.append(Paragraph(
@@ -1341,14 +1613,7 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     ))
     
     cta_box = Table([[cta_content]], colWidths=[6.8*inch])
-    cta_box.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, -1), HexColor("#f0fdfa")),
-        ("BOX", (0, 0), (-1, -1), 1.5, HexColor(COLORS["primary"])),
-        ("LEFTPADDING", (0, 0), (-1, -1), 14),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 14),
-        ("TOPPADDING", (0, 0), (-1, -1), 10),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-    ]))
+    cta_box.setStyle(_CTA_BOX_STYLE)
     story.append(cta_box)
     
     # ========== PAGE 1 ENDS HERE ==========
@@ -1363,49 +1628,26 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     cat_df = cat_df.sort_values("unique_this_week", ascending=False)
     
     # Build single table with 4 columns (Cat1, Unique1, Cat2, Unique2)
-    categories = list(cat_df.iterrows())
-    mid = (len(categories) + 1) // 2
-    left_cats = categories[:mid]
-    right_cats = categories[mid:]
+    cats = list(cat_df["category"].to_numpy())
+    vals = [f"{v:,}" for v in cat_df["unique_this_week"].to_numpy(dtype=np.int64)]
+    mid = (len(cats) + 1) // 2
     
     # Pad right side if uneven
-    while len(right_cats) < len(left_cats):
-        right_cats.append((None, {"category": "", "unique_this_week": ""}))
+    if len(cats) % 2:
+        cats.append("")
+        vals.append("")
     
     # Build combined table data
     cat_table_data = [[ph("Category"), ph("Unique"), ph("Category"), ph("Unique")]]
-    for (_, left_row), (_, right_row) in zip(left_cats, right_cats):
-        left_cat = left_row["category"] if left_row["category"] else ""
-        left_val = f"{int(left_row['unique_this_week']):,}" if left_row["unique_this_week"] != "" else ""
-        right_cat = right_row["category"] if right_row["category"] else ""
-        right_val = f"{int(right_row['unique_this_week']):,}" if right_row["unique_this_week"] != "" else ""
+    for left_cat, left_val, right_cat, right_val in zip(cats[:mid], vals[:mid], cats[mid:], vals[mid:]):
         cat_table_data.append([p(left_cat), pr(left_val), p(right_cat), pr(right_val)])
     
     cat_tbl = Table(cat_table_data, colWidths=[1.5*inch, 0.7*inch, 1.5*inch, 0.7*inch])
-    cat_tbl.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), HexColor(COLORS["secondary"])),
-        ("TEXTCOLOR", (0, 0), (-1, 0), white),
-        ("FONTSIZE", (0, 0), (-1, -1), 8),
-        ("ALIGN", (0, 0), (0, -1), "LEFT"),
-        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-        ("ALIGN", (2, 0), (2, -1), "LEFT"),
-        ("ALIGN", (3, 0), (3, -1), "RIGHT"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("GRID", (0, 0), (-1, -1), 0.25, HexColor(COLORS["grid"])),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#ffffff"), HexColor("#f9fafb")]),
-        ("LEFTPADDING", (0, 0), (-1, -1), 6),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-        ("TOPPADDING", (0, 0), (-1, -1), 3),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        # Add vertical line between left and right sections (data rows only, not header)
-        ("LINEAFTER", (1, 1), (1, -1), 0.75, HexColor(COLORS["secondary"])),
-    ]))
+    cat_tbl.setStyle(_CATEGORY_TABLE_STYLE)
     
     # Center the table
     cat_wrapper = Table([[cat_tbl]], colWidths=[7*inch])
-    cat_wrapper.setStyle(TableStyle([
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-    ]))
+    cat_wrapper.setStyle(_CENTER_WRAPPER_STYLE)
     story.append(cat_wrapper)
     story.append(Spacer(1, 8))
     
@@ -1417,61 +1659,29 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
     new_sku_rows = metrics.get("new_sku_rows", [])
     new_brand_rows = metrics.get("new_brand_rows", [])
     
-    # Primary: take from Top New SKUs first
-    teaser_rows = []
-    teaser_rows.extend(new_sku_rows[:4])
-    
-    # Fill remaining from Top New Brands
-    if len(teaser_rows) < 6:
-        teaser_rows.extend(new_brand_rows[:6-len(teaser_rows)])
-    
-    # If still need more, pull additional from SKUs
-    if len(teaser_rows) < 6:
-        remaining_skus = new_sku_rows[4:]
-        teaser_rows.extend(remaining_skus[:6-len(teaser_rows)])
+    # Top New SKUs first (4), then Top New Brands, then any further SKUs, up to 6 rows
+    teaser_rows = list(islice(chain(new_sku_rows[:4], new_brand_rows, new_sku_rows[4:]), 6))
     
     # FALLBACK: If still < 6, pull from week's raw data
-    if len(teaser_rows) < 6:
-        week_start = metrics.get("week_start")
-        week_end = metrics.get("week_end")
-        if week_start and week_end:
-            week_df_fallback = df[(df["approval_date"] >= week_start) & (df["approval_date"] <= week_end)].copy()
-            week_df_fallback = week_df_fallback.sort_values("approval_date", ascending=False).head(6 - len(teaser_rows))
-            for _, row in week_df_fallback.iterrows():
-                teaser_rows.append({
-                    "brand_name": str(row.get("brand_name", "")).strip(),
-                    "fanciful_name": str(row.get("fanciful_name", "")).strip(),
-                    "category": row.get("category", "Other"),
-                    "origin": str(row.get("origin_code", "")).strip(),
-                    "approval_date": row.get("approval_date"),
-                    "ttb_id": str(row.get("ttb_id", "")).strip(),
-                    "signal": "REFILE",
-                })
+    if len(teaser_rows) < 6 and not week_df.empty:
+        # Most recent few rows of the week (window taken once above), partial top-k, no full sort
+        week_df_fallback = week_df.nlargest(6 - len(teaser_rows), "approval_date")
+        fallback_cols = ["brand_name", "fanciful_name", "category", "origin_code", "approval_date", "ttb_id"]
+        for r in week_df_fallback[fallback_cols].itertuples(index=False):
+            teaser_rows.append({
+                "brand_name": str(r.brand_name).strip(),
+                "fanciful_name": str(r.fanciful_name).strip(),
+                "category": r.category,
+                "origin": str(r.origin_code).strip(),
+                "approval_date": r.approval_date,
+                "ttb_id": str(r.ttb_id).strip(),
+                "signal": "REFILE",
+            })
     
     # Only render the table if we have data
     if len(teaser_rows) > 0:
         story.append(Paragraph("What Pro Members Get (Example)", styles["BI_Section"]))
         
-        # State/Country abbreviation mapping
-        ORIGIN_ABBREV = {
-            'ALABAMA': 'AL', 'ALASKA': 'AK', 'ARIZONA': 'AZ', 'ARKANSAS': 'AR', 'CALIFORNIA': 'CA',
-            'COLORADO': 'CO', 'CONNECTICUT': 'CT', 'DELAWARE': 'DE', 'FLORIDA': 'FL', 'GEORGIA': 'GA',
-            'HAWAII': 'HI', 'IDAHO': 'ID', 'ILLINOIS': 'IL', 'INDIANA': 'IN', 'IOWA': 'IA',
-            'KANSAS': 'KS', 'KENTUCKY': 'KY', 'LOUISIANA': 'LA', 'MAINE': 'ME', 'MARYLAND': 'MD',
-            'MASSACHUSETTS': 'MA', 'MICHIGAN': 'MI', 'MINNESOTA': 'MN', 'MISSISSIPPI': 'MS', 'MISSOURI': 'MO',
-            'MONTANA': 'MT', 'NEBRASKA': 'NE', 'NEVADA': 'NV', 'NEW HAMPSHIRE': 'NH', 'NEW JERSEY': 'NJ',
-            'NEW MEXICO': 'NM', 'NEW YORK': 'NY', 'NORTH CAROLINA': 'NC', 'NORTH DAKOTA': 'ND', 'OHIO': 'OH',
-            'OKLAHOMA': 'OK', 'OREGON': 'OR', 'PENNSYLVANIA': 'PA', 'RHODE ISLAND': 'RI', 'SOUTH CAROLINA': 'SC',
-            'SOUTH DAKOTA': 'SD', 'TENNESSEE': 'TN', 'TEXAS': 'TX', 'UTAH': 'UT', 'VERMONT': 'VT',
-            'VIRGINIA': 'VA', 'WASHINGTON': 'WA', 'WEST VIRGINIA': 'WV', 'WISCONSIN': 'WI', 'WYOMING': 'WY',
-            'DISTRICT OF COLUMBIA': 'DC', 'PUERTO RICO': 'PR',
-            # Countries
-            'FRANCE': 'FR', 'SPAIN': 'ES', 'ITALY': 'IT', 'GERMANY': 'DE', 'UNITED KINGDOM': 'UK',
-            'MEXICO': 'MX', 'CANADA': 'CA', 'AUSTRALIA': 'AU', 'ARGENTINA': 'AR', 'CHILE': 'CL',
-            'IRELAND': 'IE', 'SCOTLAND': 'SCO', 'JAPAN': 'JP', 'NEW ZEALAND': 'NZ', 'SOUTH AFRICA': 'ZA',
-            'PORTUGAL': 'PT', 'NETHERLANDS': 'NL', 'BELGIUM': 'BE', 'AUSTRIA': 'AT', 'GREECE': 'GR',
-        }
-        
         # Header row
         pro_teaser_data = [[
             ph("Brand"),
@@ -1485,17 +1695,17 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
         # Data rows - show ALL columns
         for row in teaser_rows[:6]:
             brand = row.get("brand_name", "")
-            brand_display = brand[:20] + "..." if len(brand) > 20 else brand if brand else "—"
+            brand_display = _trunc(brand, 20) or "—"
             
             # SKU column = fanciful_name, fallback to product_name or placeholder
             fanciful = row.get("fanciful_name", "")
             if fanciful and fanciful.upper() not in ("NONE", "N/A", ""):
-                sku_display = fanciful[:22] + "..." if len(fanciful) > 22 else fanciful
+                sku_display = _trunc(fanciful, 22)
             else:
                 # Fallback to product_name if available
                 product_name = row.get("product_name", "")
                 if product_name and product_name.upper() not in ("NONE", "N/A", ""):
-                    sku_display = product_name[:22] + "..." if len(product_name) > 22 else product_name
+                    sku_display = _trunc(product_name, 22)
                 else:
                     sku_display = "(No fanciful name)"
             
@@ -1536,28 +1746,11 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
             pro_teaser_data,
             colWidths=[1.2*inch, 1.6*inch, 0.7*inch, 0.8*inch, 0.55*inch, 0.6*inch]
         )
-        pro_teaser_tbl.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), HexColor(COLORS["secondary"])),
-            ("TEXTCOLOR", (0, 0), (-1, 0), white),
-            ("FONTSIZE", (0, 0), (-1, 0), 8),
-            ("FONTSIZE", (0, 1), (-1, -1), 8),
-            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-            ("ALIGN", (0, 1), (1, -1), "LEFT"),
-            ("ALIGN", (2, 1), (-1, -1), "CENTER"),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("GRID", (0, 0), (-1, -1), 0.25, HexColor(COLORS["grid"])),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#ffffff"), HexColor("#f9fafb")]),
-            ("LEFTPADDING", (0, 0), (-1, -1), 4),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-            ("TOPPADDING", (0, 0), (-1, -1), 3),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        ]))
+        pro_teaser_tbl.setStyle(_PRO_TEASER_TABLE_STYLE)
         
         # Center the table
         pro_wrapper = Table([[pro_teaser_tbl]], colWidths=[7*inch])
-        pro_wrapper.setStyle(TableStyle([
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ]))
+        pro_wrapper.setStyle(_CENTER_WRAPPER_STYLE)
         story.append(pro_wrapper)
     
     story.append(Spacer(1, 6))
@@ -1571,8 +1764,6 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
         styles["BI_Small"]
     ))
 
-    md_path = asset("market_direction.png")
-    chart_market_direction(metrics["weekly_df"], md_path)
     story.append(Image(md_path, width=7.0*inch, height=2.25*inch))
     
     # ========== PAGE 2 ENDS HERE ==========
@@ -1620,8 +1811,6 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
         styles["BI_Small"]
     ))
 
-    comp_path = asset("competitive_activity.png")
-    chart_competitive_activity(df, metrics["week_start"], metrics["week_end"], comp_path)
     story.append(Image(comp_path, width=7.0*inch, height=3.5*inch))
     
     story.append(Spacer(1, 4))
@@ -1644,18 +1833,24 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
         ),
     ]
     upgrade_tbl2 = Table([[upgrade_content2]], colWidths=[6.5*inch])
-    upgrade_tbl2.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, -1), HexColor("#f8fafc")),
-        ("BOX", (0, 0), (-1, -1), 1, HexColor(COLORS["primary"])),
-        ("LEFTPADDING", (0, 0), (-1, -1), 10),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-        ("TOPPADDING", (0, 0), (-1, -1), 8),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-    ]))
+    upgrade_tbl2.setStyle(_UPGRADE_BOX_STYLE)
     story.append(upgrade_tbl2)
 
-    # Build the PDF
-    doc.build(story, onFirstPage=draw_header_footer, onLaterPages=draw_header_footer)
+    # Build the PDF with ReportLab's attribute validation off (restored afterwards),
+    # writing through one large buffer rather than the default-sized one
+    prev_shape_checking = rl_config.shapeChecking
+    rl_config.shapeChecking = 0
+    try:
+        with open(out_pdf, "wb", buffering=PDF_WRITE_BUFFER) as fh:
+            doc = SimpleDocTemplate(
+                fh, pagesize=letter,
+                leftMargin=0.65*inch, rightMargin=0.65*inch,
+                topMargin=0.75*inch, bottomMargin=0.65*inch,
+                title="BevAlc Intelligence — Weekly Snapshot"
+            )
+            doc.build(story, onFirstPage=draw_header_footer, onLaterPages=draw_header_footer)
+    finally:
+        rl_config.shapeChecking = prev_shape_checking
     logger.info(f"Saved PDF: {out_pdf}")
 
 
@@ -1663,16 +1858,17 @@ def build_pdf(df: pd.DataFrame, metrics: Dict, out_pdf: str):
 # MAIN
 # =============================================================================
 
-def generate_report(dry_run: bool = False):
-    df = fetch_historical_data()
+def generate_report(dry_run: bool = False, use_cache: bool = True):
+    df = fetch_historical_data(use_cache=use_cache)
     if df.empty:
         raise RuntimeError("No data fetched. Check D1 creds and database contents.")
+    df = _normalized(df)
 
     metrics = compute_metrics(df)
 
     eow = metrics["week_end"].strftime("%Y-%m-%d")
     report_dir = os.path.join(OUTPUT_DIR, eow)
-    os.makedirs(report_dir, exist_ok=True)
+    _ensure_dir(report_dir)
 
     out_pdf = os.path.join(report_dir, f"bevalc_weekly_snapshot_{eow}.pdf")
 
@@ -1693,8 +1889,9 @@ def generate_report(dry_run: bool = False):
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--dry-run", action="store_true", help="Fetch + compute metrics, but do not build PDF")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the on-disk data cache and re-fetch from D1")
     args = parser.parse_args()
-    generate_report(dry_run=args.dry_run)
+    generate_report(dry_run=args.dry_run, use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":
@@ -31,12 +31,28 @@ import os
 import sys
 import json
 import sqlite3
+import time
+import atexit
 import argparse
 import logging
-import subprocess
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from dotenv import load_dotenv
+    HAS_DOTENV = True
+except ImportError:
+    HAS_DOTENV = False
 
 # Add scripts dir to path for imports
 SCRIPT_DIR = Path(__file__).parent.resolve()
@@ -48,6 +64,7 @@ from lib.d1_utils import (
     d1_execute,
     escape_sql_value,
     d1_insert_batch,
+    D1_INSERT_BATCH_ROWS,
     make_slug,
     update_brand_slugs,
     add_new_companies,
@@ -76,13 +93,18 @@ DEFAULT_LOOKBACK_DAYS = 7
 # Load environment variables from .env file
 def load_env():
     """Load environment variables from .env file."""
-    if os.path.exists(ENV_FILE):
-        with open(ENV_FILE, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+    env_path = Path(ENV_FILE)
+    if not env_path.exists():
+        return
+    if HAS_DOTENV:
+        load_dotenv(env_path, override=True)
+        return
+    pairs = (
+        line.split('=', 1)
+        for line in env_path.read_text().splitlines()
+        if '=' in line and not line.lstrip().startswith('#')
+    )
+    os.environ.update({key.strip(): value.strip() for key, value in pairs})
 
 load_env()
 
@@ -94,6 +116,18 @@ CLOUDFLARE_API_TOKEN = os.environ.get("CLOUDFLARE_API_TOKEN")
 # Batch size for D1 inserts (D1 has limits on query size)
 D1_BATCH_SIZE = 500
 
+# COLA records per D1 insert request: d1_insert_batch packs them into
+# size-capped multi-row statements, so one POST carries several batches' worth
+D1_INSERT_ROWS = D1_INSERT_BATCH_ROWS
+
+# Concurrent D1 insert requests during a sync
+D1_INSERT_WORKERS = 4
+
+# Cloudflare's API allows 1,200 requests per 5 minutes per user. insert_batches
+# paces its workers to that average (token bucket, bursts up to one second's
+# worth); other D1 calls are not throttled
+D1_INSERT_REQUESTS_PER_SEC = 4
+
 # Validate required env vars
 def validate_config():
     """Check that all required config is present and initialize D1."""
@@ -149,18 +183,152 @@ logger = setup_logging()
 # CLOUDFLARE D1 SYNC FUNCTION
 # ============================================================================
 
+# Read-side tuning for the local DB scan in sync_to_d1: memory-mapped I/O (256 MB),
+# a 64 MB page cache and in-memory temp storage. Journal mode is left alone since
+# it is a persistent property of the database file.
+LOCAL_READ_PRAGMAS = """
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA temp_store=MEMORY;
+"""
+
+# Local table holding the sync watermark: the highest local colas.id known to be
+# in D1. D1 assigns its own ids on insert, so the watermark has to live locally.
+SYNC_STATE_TABLE = "d1_sync_state"
+
+
+# Process-wide connection to the local database, reused across sync_to_d1 calls
+# so the page cache and memory map stay warm
+_LOCAL_CONN: Optional[sqlite3.Connection] = None
+_LOCAL_CONN_PATH: Optional[str] = None
+
+
+def _get_local_conn(path: str) -> sqlite3.Connection:
+    """Return the cached connection to the local database at path, opening it if needed."""
+    global _LOCAL_CONN, _LOCAL_CONN_PATH
+    if _LOCAL_CONN is None or _LOCAL_CONN_PATH != path:
+        _close_local_conn()
+        _LOCAL_CONN = sqlite3.connect(path)
+        _LOCAL_CONN.executescript(LOCAL_READ_PRAGMAS)
+        _LOCAL_CONN_PATH = path
+    return _LOCAL_CONN
+
+
+def _close_local_conn():
+    """Close the cached local database connection, if one is open."""
+    global _LOCAL_CONN, _LOCAL_CONN_PATH
+    if _LOCAL_CONN is not None:
+        _LOCAL_CONN.close()
+        _LOCAL_CONN = None
+        _LOCAL_CONN_PATH = None
+
+
+atexit.register(_close_local_conn)
+
+
+def get_sync_watermark(conn: sqlite3.Connection) -> Optional[int]:
+    """Return the last local colas.id synced to D1, or None if never recorded."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [SYNC_STATE_TABLE]
+    ).fetchone()
+    if not exists:
+        return None
+    row = conn.execute(f"SELECT last_id FROM {SYNC_STATE_TABLE} WHERE name = 'colas'").fetchone()
+    return row[0] if row else None
+
+
+def set_sync_watermark(conn: sqlite3.Connection, last_id: int):
+    """Record that every local colas row with id <= last_id is in D1."""
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} (name TEXT PRIMARY KEY, last_id INTEGER NOT NULL)")
+    conn.execute(
+        f"INSERT OR REPLACE INTO {SYNC_STATE_TABLE} (name, last_id) VALUES ('colas', ?)", [last_id]
+    )
+    conn.commit()
+
+
+_insert_rate_lock = threading.Lock()
+_insert_rate_state = {'tokens': float(D1_INSERT_REQUESTS_PER_SEC), 'updated': time.monotonic()}
+
+
+def _wait_for_insert_slot():
+    """Block until the insert token bucket allows another D1 request."""
+    with _insert_rate_lock:
+        now = time.monotonic()
+        tokens = min(
+            float(D1_INSERT_REQUESTS_PER_SEC),
+            _insert_rate_state['tokens'] + (now - _insert_rate_state['updated']) * D1_INSERT_REQUESTS_PER_SEC
+        )
+        # Take the token now (possibly going negative) and sleep off any deficit outside the lock
+        _insert_rate_state['tokens'] = tokens - 1
+        _insert_rate_state['updated'] = now
+        wait = (1 - tokens) / D1_INSERT_REQUESTS_PER_SEC if tokens < 1 else 0
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _paced_insert_batch(batch: List[Dict]) -> Dict:
+    """
+    d1_insert_batch with RETURNING ttb_id, after waiting for a slot under
+    D1_INSERT_REQUESTS_PER_SEC.
+    """
+    _wait_for_insert_slot()
+    return d1_insert_batch(batch, returning=True)
+
+
+def insert_batches(batches: Iterable[List[Dict]], total_batches: int) -> Iterator[Tuple[List[Dict], Dict]]:
+    """
+    Send record batches to D1 over D1_INSERT_WORKERS threads.
+
+    Yields (batch, d1_insert_batch result) in batch order; each result carries
+    the ttb_ids D1 actually inserted ('inserted_ids'). At most two rounds
+    of batches are in flight, so a streamed source is not read far ahead.
+    INSERT OR IGNORE makes the requests order-independent on the D1 side;
+    requests are paced to D1_INSERT_REQUESTS_PER_SEC.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=D1_INSERT_WORKERS) as pool:
+        for batch_num, batch in enumerate(batches, start=1):
+            logger.info("  Inserting batch %d/%d (%d records)...", batch_num, total_batches, len(batch))
+            pending.append((batch, pool.submit(_paced_insert_batch, batch)))
+            if len(pending) >= 2 * D1_INSERT_WORKERS:
+                batch, future = pending.popleft()
+                yield batch, future.result()
+        while pending:
+            batch, future = pending.popleft()
+            yield batch, future.result()
+
+
+def update_lookup_tables(records: List[Dict], dry_run: bool = False):
+    """Add brand slugs and companies for synced records, deduplicating names in one pass."""
+    brands = set()
+    companies = set()
+    for record in records:
+        brands.add(record.get('brand_name'))
+        companies.add(record.get('company_name'))
+    brands.discard(None)
+    companies.discard(None)
+
+    # Update brand_slugs table with new brands for SEO pages
+    update_brand_slugs(records, dry_run, unique_brands=brands)
+
+    # Add new companies to companies/company_aliases tables
+    add_new_companies(records, dry_run, unique_companies=companies)
+
+
 def sync_to_d1(local_db_path: str, dry_run: bool = False, records_to_sync: List[Dict] = None) -> Dict:
     """
     Sync records to Cloudflare D1.
     
     If records_to_sync is provided, only sync those records (fast path).
-    Otherwise, sync all local records using INSERT OR IGNORE (D1 handles dedup).
+    Otherwise, sync local records above the stored watermark (keyset on id)
+    using INSERT OR IGNORE (D1 handles dedup), then advance the watermark.
     """
     logger.info("Starting D1 sync...")
+    make_slug.cache_clear()
     
     # Fast path: we already know which records to sync
     if records_to_sync is not None:
-        logger.info(f"Syncing {len(records_to_sync):,} new records to D1...")
+        logger.info("Syncing %s new records to D1...", f"{len(records_to_sync):,}")
         
         if dry_run:
             logger.info("[DRY RUN] Would insert records to D1")
@@ -173,26 +341,17 @@ def sync_to_d1(local_db_path: str, dry_run: bool = False, records_to_sync: List[
         total_inserted = 0
         all_errors = []
         
-        for i in range(0, len(records_to_sync), D1_BATCH_SIZE):
-            batch = records_to_sync[i:i + D1_BATCH_SIZE]
-            batch_num = i // D1_BATCH_SIZE + 1
-            total_batches = (len(records_to_sync) + D1_BATCH_SIZE - 1) // D1_BATCH_SIZE
-            
-            logger.info(f"  Inserting batch {batch_num}/{total_batches} ({len(batch)} records)...")
-            
-            result = d1_insert_batch(batch)
+        total_batches = (len(records_to_sync) + D1_INSERT_ROWS - 1) // D1_INSERT_ROWS
+        batches = (records_to_sync[i:i + D1_INSERT_ROWS] for i in range(0, len(records_to_sync), D1_INSERT_ROWS))
+        for batch, result in insert_batches(batches, total_batches):
             total_inserted += result.get("inserted", 0)
             
-            if result.get("errors"):
-                all_errors.extend(result["errors"])
+            if not result.get("success"):
+                all_errors.append(result.get("error", "Unknown"))
         
-        logger.info(f"Sync complete: {total_inserted:,} records inserted")
+        logger.info("Sync complete: %s records inserted", f"{total_inserted:,}")
 
-        # Update brand_slugs table with new brands for SEO pages
-        update_brand_slugs(records_to_sync, dry_run)
-
-        # Add new companies to companies/company_aliases tables
-        add_new_companies(records_to_sync, dry_run)
+        update_lookup_tables(records_to_sync, dry_run)
 
         return {
             "success": True,
@@ -207,88 +366,135 @@ def sync_to_d1(local_db_path: str, dry_run: bool = False, records_to_sync: List[
     if not os.path.exists(local_db_path):
         return {"success": False, "error": f"Local database not found: {local_db_path}"}
     
+    conn = None
     try:
-        # Get D1 count first for comparison
-        count_result = d1_execute("SELECT COUNT(*) as cnt FROM colas")
-        d1_count = 0
-        if count_result.get("success") and count_result.get("result"):
-            d1_count = count_result["result"][0].get("results", [{}])[0].get("cnt", 0)
-        
-        # Get local count
-        conn = sqlite3.connect(local_db_path)
-        conn.row_factory = sqlite3.Row
-        local_count = conn.execute("SELECT COUNT(*) FROM colas").fetchone()[0]
+        conn = _get_local_conn(local_db_path)
+        # One read transaction: the probes, watermark and row scan see the same snapshot
+        conn.execute("BEGIN")
         
-        logger.info(f"Local database has {local_count:,} records")
-        logger.info(f"D1 database has {d1_count:,} records")
+        # MAX(id) is answered from the primary key index; D1 assigns its own ids,
+        # so the local max is compared against the stored watermark, not D1's
+        local_max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM colas").fetchone()[0]
+        stored_watermark = watermark = get_sync_watermark(conn)
         
-        if local_count == d1_count:
-            logger.info("Databases are in sync - nothing to do")
-            conn.close()
+        if watermark is None:
+            # First keyset sync: one-time COUNT comparison to size the backlog
+            count_result = d1_execute("SELECT COUNT(*) as cnt FROM colas")
+            d1_count = 0
+            if count_result.get("success") and count_result.get("result"):
+                d1_count = count_result["result"][0].get("results", [{}])[0].get("cnt", 0)
+            local_count = conn.execute("SELECT COUNT(*) FROM colas").fetchone()[0]
+            
+            logger.info("Local database has %s records", f"{local_count:,}")
+            logger.info("D1 database has %s records", f"{d1_count:,}")
+            
+            if local_count == d1_count:
+                logger.info("Databases are in sync - nothing to do")
+                if not dry_run:
+                    set_sync_watermark(conn, local_max_id)
+                return {"success": True, "inserted": 0, "new_records": []}
+            
+            # Start below the newest (local - D1) rows plus a small buffer
+            row = conn.execute(
+                "SELECT id FROM colas ORDER BY id DESC LIMIT 1 OFFSET ?", [local_count - d1_count + 1000]
+            ).fetchone()
+            watermark = row[0] if row else 0
+            logger.info("No sync watermark recorded, starting after local id %s", f"{watermark:,}")
+        elif local_max_id <= watermark:
+            logger.info("Databases are in sync through local id %s - nothing to do", f"{watermark:,}")
             return {"success": True, "inserted": 0, "new_records": []}
+        else:
+            logger.info("Syncing local records after id %s (local max id %s)", f"{watermark:,}", f"{local_max_id:,}")
         
-        new_count = local_count - d1_count
-        logger.info(f"New records to sync: {new_count:,}")
+        to_fetch = conn.execute("SELECT COUNT(*) FROM colas WHERE id > ?", [watermark]).fetchone()[0]
+        logger.info("New records to sync: %s", f"{to_fetch:,}")
         
         if dry_run:
             logger.info("[DRY RUN] Would insert records to D1")
-            conn.close()
             return {
                 "success": True,
                 "dry_run": True,
-                "new_records_count": new_count,
-                "total_local": local_count,
-                "total_d1": d1_count
+                "new_records_count": to_fetch,
+                "watermark": watermark,
+                "local_max_id": local_max_id
             }
         
-        # Get all local records and insert with INSERT OR IGNORE
-        # D1 will skip duplicates automatically
+        # Stream local records past the watermark in id order, in insert-sized chunks,
+        # and insert with INSERT OR IGNORE (D1 will skip duplicates automatically)
         logger.info("Fetching local records for sync...")
-        cursor = conn.execute("SELECT * FROM colas ORDER BY id DESC LIMIT ?", [new_count + 1000])  # Small buffer
+        if HAS_ORJSON:
+            # Let SQLite build each record as a JSON object; orjson decodes it faster
+            # than Python can zip a row tuple into a dict
+            columns = [info[1] for info in conn.execute("PRAGMA table_info(colas)")]
+            pairs = ", ".join(f"'{c}', \"{c}\"" for c in columns)
+            cursor = conn.execute(
+                f"SELECT json_object({pairs}) FROM colas WHERE id > ? ORDER BY id", [watermark]
+            )
+        else:
+            cursor = conn.execute("SELECT * FROM colas WHERE id > ? ORDER BY id", [watermark])
+            columns = [d[0] for d in cursor.description]
         
-        records = [dict(row) for row in cursor]
-        conn.close()
+        def batches():
+            while True:
+                rows = cursor.fetchmany(D1_INSERT_ROWS)
+                if not rows:
+                    break
+                if HAS_ORJSON:
+                    yield [orjson.loads(row[0]) for row in rows]
+                else:
+                    yield [dict(zip(columns, row)) for row in rows]
         
-        logger.info(f"Syncing {len(records):,} records (INSERT OR IGNORE)...")
+        logger.info("Syncing %s records (INSERT OR IGNORE)...", f"{to_fetch:,}")
         
         total_inserted = 0
+        total_attempted = 0
         all_errors = []
+        synced_records = []  # rows D1 did not have yet, for brand/company updates and classification
+        synced_through = watermark  # last id of the unbroken run of successful batches
+        total_batches = (to_fetch + D1_INSERT_ROWS - 1) // D1_INSERT_ROWS
         
-        for i in range(0, len(records), D1_BATCH_SIZE):
-            batch = records[i:i + D1_BATCH_SIZE]
-            batch_num = i // D1_BATCH_SIZE + 1
-            total_batches = (len(records) + D1_BATCH_SIZE - 1) // D1_BATCH_SIZE
-            
-            logger.info(f"  Inserting batch {batch_num}/{total_batches} ({len(batch)} records)...")
+        # D1's REST API rejects BEGIN/COMMIT, so the sync cannot be one transaction.
+        # Each batch is a single request whose statements succeed or fail together;
+        # the watermark only moves past the unbroken run of successful batches, so
+        # a failed batch (and anything after it) is re-sent by the next sync
+        for batch, result in insert_batches(batches(), total_batches):
+            total_attempted += len(batch)
             
-            result = d1_insert_batch(batch)
-            total_inserted += result.get("inserted", 0)
-            
-            if result.get("errors"):
-                all_errors.extend(result["errors"])
+            if result.get("success"):
+                inserted = result.get("inserted", 0)
+                total_inserted += inserted
+                # Keep exactly the rows D1 did not have yet (RETURNING ttb_id)
+                if inserted:
+                    inserted_ids = set(result.get("inserted_ids", ()))
+                    synced_records.extend(r for r in batch if r["ttb_id"] in inserted_ids)
+                if not all_errors:
+                    synced_through = batch[-1]["id"]
+            else:
+                all_errors.append(result.get("error", "Unknown"))
         
-        logger.info(f"Sync complete: {total_inserted:,} records inserted")
+        logger.info("Sync complete: %s records inserted", f"{total_inserted:,}")
+        # Persist a bootstrapped watermark even if its first batch failed, so the
+        # retry resends the same batches instead of re-estimating the start point
+        if synced_through != stored_watermark:
+            set_sync_watermark(conn, synced_through)
 
-        # Update brand_slugs table with new brands for SEO pages
-        synced_records = records[:total_inserted] if total_inserted > 0 else []
-        update_brand_slugs(synced_records, dry_run)
-
-        # Add new companies to companies/company_aliases tables
-        add_new_companies(synced_records, dry_run)
+        update_lookup_tables(synced_records, dry_run)
 
         return {
             "success": True,
             "inserted": total_inserted,
-            "attempted": len(records),
+            "attempted": total_attempted,
             "errors": all_errors[:5] if all_errors else [],
             "new_records": synced_records
         }
         
     except Exception as e:
-        logger.error(f"Sync failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Sync failed")
         return {"success": False, "error": str(e)}
+    finally:
+        # End the read transaction but keep the connection for the next sync
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
 
 # ============================================================================
 # SCRAPING - Using ColaWorker
@@ -302,6 +508,44 @@ except ImportError:
     SCRAPER_AVAILABLE = False
     logger.warning("ColaWorker not available - scraping disabled")
 
+# One scraper per process, so repeated scrapes reuse the same Firefox instead of
+# paying browser (and geckodriver) startup each time; see _get_scraper()
+_SCRAPER = None
+
+
+def _get_scraper(db_path: str) -> 'ColaWorker':
+    """Return the process's ColaWorker, writing to db_path, creating it if needed."""
+    global _SCRAPER
+    if _SCRAPER is None:
+        _SCRAPER = ColaWorker(
+            name="weekly_update",
+            db_path=db_path,
+            headless=True,
+            request_delay=1.5,
+            page_timeout=30,
+            max_retries=3
+        )
+    elif _SCRAPER.conn is None or _SCRAPER.db_path != db_path:
+        _SCRAPER.open_database(db_path)
+    return _SCRAPER
+
+
+def _release_scraper_db():
+    """Close the scraper's database (e.g. before replacing the file); keep its browser."""
+    if _SCRAPER is not None:
+        _SCRAPER.close_database()
+
+
+def _close_scraper():
+    """Shut down the cached scraper and its browser, if one was started."""
+    global _SCRAPER
+    if _SCRAPER is not None:
+        _SCRAPER.close()
+        _SCRAPER = None
+
+
+atexit.register(_close_scraper)
+
 
 def scrape_recent_days(days: int = 7) -> Dict:
     """
@@ -323,20 +567,12 @@ def scrape_recent_days(days: int = 7) -> Dict:
     temp_db = os.path.join(os.path.dirname(DB_PATH), "weekly_temp.db")
 
     # Remove old temp db if exists
-    if os.path.exists(temp_db):
-        os.remove(temp_db)
+    _release_scraper_db()
+    _remove_temp_db(temp_db)
 
-    worker = None
     try:
         # Use ColaWorker with robust retry logic
-        worker = ColaWorker(
-            name="weekly_update",
-            db_path=temp_db,
-            headless=True,
-            request_delay=1.5,
-            page_timeout=30,
-            max_retries=3
-        )
+        worker = _get_scraper(temp_db)
 
         # Process the date range
         result = worker.process_date_range(start_date, end_date)
@@ -346,7 +582,7 @@ def scrape_recent_days(days: int = 7) -> Dict:
         total_colas = conn.execute("SELECT COUNT(*) FROM colas").fetchone()[0]
         conn.close()
 
-        worker.close()
+        worker.close_database()
 
         return {
             'success': True,
@@ -362,8 +598,7 @@ def scrape_recent_days(days: int = 7) -> Dict:
         logger.error(f"Scraping failed: {e}")
         import traceback
         traceback.print_exc()
-        if worker:
-            worker.close()
+        _close_scraper()
         return {
             'success': False,
             'error': str(e)
@@ -384,20 +619,12 @@ def scrape_date_range(start_date: datetime, end_date: datetime) -> Dict:
     temp_db = os.path.join(os.path.dirname(DB_PATH), "weekly_temp.db")
 
     # Remove old temp db if exists
-    if os.path.exists(temp_db):
-        os.remove(temp_db)
+    _release_scraper_db()
+    _remove_temp_db(temp_db)
 
-    worker = None
     try:
         # Use ColaWorker with robust retry logic
-        worker = ColaWorker(
-            name="weekly_update",
-            db_path=temp_db,
-            headless=True,
-            request_delay=1.5,
-            page_timeout=30,
-            max_retries=3
-        )
+        worker = _get_scraper(temp_db)
 
         # Process the date range
         result = worker.process_date_range(start_date, end_date)
@@ -407,7 +634,7 @@ def scrape_date_range(start_date: datetime, end_date: datetime) -> Dict:
         total_colas = conn.execute("SELECT COUNT(*) FROM colas").fetchone()[0]
         conn.close()
 
-        worker.close()
+        worker.close_database()
 
         return {
             'success': True,
@@ -423,8 +650,7 @@ def scrape_date_range(start_date: datetime, end_date: datetime) -> Dict:
         logger.error(f"Scraping failed: {e}")
         import traceback
         traceback.print_exc()
-        if worker:
-            worker.close()
+        _close_scraper()
         return {
             'success': False,
             'error': str(e)
@@ -435,6 +661,42 @@ def scrape_date_range(start_date: datetime, end_date: datetime) -> Dict:
 # MERGING
 # ============================================================================
 
+# COLA columns copied from the scrape database into the consolidated one
+MERGE_COLUMNS = (
+    'ttb_id', 'status', 'vendor_code', 'serial_number', 'class_type_code',
+    'origin_code', 'brand_name', 'fanciful_name', 'type_of_application',
+    'for_sale_in', 'total_bottle_capacity', 'formula', 'approval_date',
+    'qualifications', 'grape_varietal', 'wine_vintage', 'appellation',
+    'alcohol_content', 'ph_level', 'plant_registry', 'company_name',
+    'street', 'state', 'contact_person', 'phone_number', 'year', 'month', 'day',
+)
+
+# Write-side tuning for merge_new_data: one fsync per commit at most (NORMAL),
+# a 64 MB page cache and in-memory temp storage. The consolidated database keeps
+# its journal mode, which is a persistent property of the file.
+MERGE_WRITE_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-65536;
+PRAGMA temp_store=MEMORY;
+PRAGMA busy_timeout=5000;
+"""
+
+# Rows per existence check / executemany while merging (kept under SQLite's
+# 999 bound-parameter limit for the IN query)
+MERGE_CHUNK_SIZE = 900
+
+
+def _remove_temp_db(temp_db: str):
+    """Delete the temp scrape database and its WAL/shared-memory files.
+
+    ColaWorker opens it in WAL mode, and a stale -wal left next to a fresh
+    weekly_temp.db would be replayed into it on the next open.
+    """
+    for path in (temp_db, temp_db + "-wal", temp_db + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
 def merge_new_data(temp_db: str) -> Dict:
     """
     Merge new data from temp database into consolidated database.
@@ -449,77 +711,58 @@ def merge_new_data(temp_db: str) -> Dict:
         # Connect to both databases
         src = sqlite3.connect(temp_db)
         src.row_factory = sqlite3.Row
+        src.executescript(LOCAL_READ_PRAGMAS)
         dst = sqlite3.connect(DB_PATH)
+        dst.executescript(MERGE_WRITE_PRAGMAS)
 
         # Get column names from destination to handle schema differences
         dst_cols = set(row[1] for row in dst.execute("PRAGMA table_info(colas)").fetchall())
         has_day_column = 'day' in dst_cols
 
-        # Merge COLAs
-        rows = src.execute("SELECT * FROM colas").fetchall()
+        # Merge COLAs: skip rows whose ttb_id is already present (one IN query per
+        # chunk instead of a changes() probe per row), then insert the rest in bulk
+        columns = [c for c in MERGE_COLUMNS if c != 'day' or has_day_column]  # local DB may lack 'day'
+        insert_sql = (
+            f"INSERT OR IGNORE INTO colas ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
 
         added = 0
         new_records = []  # Track the actual records that were added
 
-        for row in rows:
-            r = dict(row)
+        cursor = src.execute("SELECT * FROM colas")
+        dst.execute("BEGIN")
+        while True:
+            chunk = cursor.fetchmany(MERGE_CHUNK_SIZE)
+            if not chunk:
+                break
+            ttb_ids = [row['ttb_id'] for row in chunk]
+            existing = {
+                ttb_id for (ttb_id,) in dst.execute(
+                    f"SELECT ttb_id FROM colas WHERE ttb_id IN ({', '.join('?' * len(ttb_ids))})", ttb_ids
+                )
+            }
+            fresh = [dict(row) for row in chunk if row['ttb_id'] not in existing]
+            values = [tuple(r.get(c) for c in columns) for r in fresh]
+            dst.execute("SAVEPOINT merge_chunk")
             try:
-                if has_day_column:
-                    dst.execute("""
-                        INSERT OR IGNORE INTO colas
-                        (ttb_id, status, vendor_code, serial_number, class_type_code,
-                         origin_code, brand_name, fanciful_name, type_of_application,
-                         for_sale_in, total_bottle_capacity, formula, approval_date,
-                         qualifications, grape_varietal, wine_vintage, appellation,
-                         alcohol_content, ph_level, plant_registry, company_name,
-                         street, state, contact_person, phone_number, year, month, day)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        r.get('ttb_id'), r.get('status'), r.get('vendor_code'),
-                        r.get('serial_number'), r.get('class_type_code'),
-                        r.get('origin_code'), r.get('brand_name'),
-                        r.get('fanciful_name'), r.get('type_of_application'),
-                        r.get('for_sale_in'), r.get('total_bottle_capacity'),
-                        r.get('formula'), r.get('approval_date'),
-                        r.get('qualifications'), r.get('grape_varietal'),
-                        r.get('wine_vintage'), r.get('appellation'),
-                        r.get('alcohol_content'), r.get('ph_level'),
-                        r.get('plant_registry'), r.get('company_name'),
-                        r.get('street'), r.get('state'),
-                        r.get('contact_person'), r.get('phone_number'),
-                        r.get('year'), r.get('month'), r.get('day')
-                    ))
-                else:
-                    # Local DB doesn't have 'day' column - skip it
-                    dst.execute("""
-                        INSERT OR IGNORE INTO colas
-                        (ttb_id, status, vendor_code, serial_number, class_type_code,
-                         origin_code, brand_name, fanciful_name, type_of_application,
-                         for_sale_in, total_bottle_capacity, formula, approval_date,
-                         qualifications, grape_varietal, wine_vintage, appellation,
-                         alcohol_content, ph_level, plant_registry, company_name,
-                         street, state, contact_person, phone_number, year, month)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        r.get('ttb_id'), r.get('status'), r.get('vendor_code'),
-                        r.get('serial_number'), r.get('class_type_code'),
-                        r.get('origin_code'), r.get('brand_name'),
-                        r.get('fanciful_name'), r.get('type_of_application'),
-                        r.get('for_sale_in'), r.get('total_bottle_capacity'),
-                        r.get('formula'), r.get('approval_date'),
-                        r.get('qualifications'), r.get('grape_varietal'),
-                        r.get('wine_vintage'), r.get('appellation'),
-                        r.get('alcohol_content'), r.get('ph_level'),
-                        r.get('plant_registry'), r.get('company_name'),
-                        r.get('street'), r.get('state'),
-                        r.get('contact_person'), r.get('phone_number'),
-                        r.get('year'), r.get('month')
-                    ))
-                if dst.execute("SELECT changes()").fetchone()[0] > 0:
-                    added += 1
-                    new_records.append(r)  # Save the record that was actually added
-            except Exception as e:
-                logger.warning(f"Failed to insert {r.get('ttb_id')}: {e}")
+                dst.executemany(insert_sql, values)
+                dst.execute("RELEASE merge_chunk")
+            except sqlite3.Error as e:
+                # Undo the partial chunk and insert it row by row, skipping bad rows
+                dst.execute("ROLLBACK TO merge_chunk")
+                dst.execute("RELEASE merge_chunk")
+                logger.warning(f"Bulk insert failed ({e}); retrying {len(fresh)} rows one at a time")
+                inserted = []
+                for r, row_values in zip(fresh, values):
+                    try:
+                        if dst.execute(insert_sql, row_values).rowcount > 0:
+                            inserted.append(r)
+                    except sqlite3.Error as row_error:
+                        logger.warning(f"Failed to insert {r.get('ttb_id')}: {row_error}")
+                fresh = inserted
+            added += len(fresh)
+            new_records.extend(fresh)  # Save the records that were actually added
         
         dst.commit()
         
@@ -530,7 +773,7 @@ def merge_new_data(temp_db: str) -> Dict:
         dst.close()
         
         # Clean up temp database
-        os.remove(temp_db)
+        _remove_temp_db(temp_db)
         logger.info(f"Removed temp database: {temp_db}")
         
         return {
@@ -972,6 +1215,7 @@ def check_watchlist_and_alert(new_records: List[Dict], dry_run: bool = False) ->
         return {'matches': total_matches, 'alerts_sent': 0, 'dry_run': True}
 
     # Send alerts via Node.js email sender (uses React Email templates)
+    import subprocess
     alerts_sent = 0
     resend_api_key = os.environ.get('RESEND_API_KEY')
 
@@ -1142,9 +1386,8 @@ def run_weekly_update(days: int = DEFAULT_LOOKBACK_DAYS, dry_run: bool = False,
             logger.info(f"Read {len(new_records):,} records from temp DB")
 
             # Clean up temp DB
-            if os.path.exists(temp_db):
-                os.remove(temp_db)
-                logger.info(f"Removed temp database: {temp_db}")
+            _remove_temp_db(temp_db)
+            logger.info(f"Removed temp database: {temp_db}")
 
         # Step 3: Sync records to D1
         logger.info("\n[STEP 3/4] Syncing to Cloudflare D1...")